@@ -1,6 +1,216 @@
+import asyncio
+import contextlib
+import copy
+import gzip
+import heapq
+import itertools
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from itertools import product
 
 import meraki
+import meraki.aio
+
+
+# Largest page the organization-wide listings accept, so a large org needs as
+# few pages (API calls) as possible
+NETWORKS_PER_PAGE = 100000
+DEVICES_PER_PAGE = 1000
+
+
+# Dashboard API budget per organization (requests per second)
+DEFAULT_RATE_LIMIT = 10
+# Times a throttled (HTTP 429) call is retried before the error is raised
+MAX_THROTTLE_RETRIES = 5
+# Calls whose results the others depend on go first (lower value = sooner)
+CALL_PRIORITY = {
+    'getOrganizations': 0,
+    'getOrganizationNetworks': 0,
+    'getOrganizationDevices': 1,
+}
+DEFAULT_PRIORITY = 2
+
+API_ERRORS = (meraki.APIError, getattr(meraki, 'AsyncAPIError', meraki.APIError))
+
+
+def retry_after(error):
+    """ Seconds to wait from a 429 error's Retry-After header, or None if it is not a 429 """
+    if getattr(error, 'status', None) != 429:
+        return None
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        return max(float(headers.get('Retry-After', 1)), 0)
+    except (TypeError, ValueError):
+        return 1.0
+
+
+class RateLimiter:
+    """
+    Token bucket for the requests of one organization. Requests wait for a
+    token instead of being sent and throttled; a 429 pauses the whole bucket
+    for the Retry-After time. Async callers are served in priority order.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE_LIMIT, burst=None):
+        self.rate = rate
+        self.capacity = burst or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.started = None
+        self.requests = 0
+        self.throttled = 0
+        self.waited = 0.0
+        self._queue = []
+        self._counter = itertools.count()
+        self._dispatcher = None
+
+    def _wait_time(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        wait = max(self.paused_until - now, 0.0)
+        if self.tokens < 1:
+            wait = max(wait, (1 - self.tokens) / self.rate)
+        return wait
+
+    def _take(self):
+        self.tokens -= 1
+        self.requests += 1
+        if self.started is None:
+            self.started = time.monotonic()
+
+    def acquire(self):
+        """ Block until a request may be sent """
+        wait = self._wait_time()
+        while wait > 0:
+            self.waited += wait
+            time.sleep(wait)
+            wait = self._wait_time()
+        self._take()
+
+    async def acquire_async(self, priority=DEFAULT_PRIORITY):
+        """ Wait (without blocking the event loop) until a request may be sent """
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._counter), future))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+        await future
+
+    async def _dispatch(self):
+        # Hands out tokens one at a time to the highest priority waiter
+        while self._queue:
+            wait = self._wait_time()
+            if wait > 0:
+                self.waited += wait
+                await asyncio.sleep(wait)
+                continue
+            _, _, future = heapq.heappop(self._queue)
+            if not future.done():
+                self._take()
+                future.set_result(None)
+
+    def pause(self, seconds):
+        """ Stop handing out tokens for ``seconds`` (Retry-After of a 429) """
+        self.throttled += 1
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def stats(self):
+        elapsed = time.monotonic() - self.started if self.started else 0.0
+        return {
+            'requests': self.requests,
+            'throttled': self.throttled,
+            'waited': self.waited,
+            'throughput': self.requests / elapsed if elapsed else 0.0,
+        }
+
+
+class ResponseCache:
+    """
+    Per-run memoization of Dashboard API responses, keyed on endpoint plus
+    arguments. Entries expire after ``ttl`` seconds. Responses are copied on the
+    way in and out, so callers may modify what they get back.
+    """
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+
+    @classmethod
+    def freeze(cls, value):
+        # Lists and dicts in the arguments (ex.: networkIds) become hashable tuples
+        if isinstance(value, dict):
+            return tuple(sorted((key, cls.freeze(item)) for key, item in value.items()))
+        if isinstance(value, (list, tuple, set)):
+            return tuple(cls.freeze(item) for item in value)
+        return value
+
+    def key(self, scope, operation, args, kwargs):
+        return scope, operation, self.freeze(args), self.freeze(kwargs)
+
+    def get(self, key):
+        """
+        :return: (True, response) on a hit, (False, None) on a miss
+        """
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            self.hits += 1
+            return True, copy.deepcopy(entry[1])
+        self.misses += 1
+        return False, None
+
+    def put(self, key, response):
+        self._entries[key] = (time.monotonic(), copy.deepcopy(response))
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+
+
+class SnapshotStore:
+    """
+    Compressed local store of Dashboard API responses (gzip JSON), keyed by
+    endpoint and parameters. In record mode every response is kept and written
+    by save(); in replay mode responses are served from the file and a call
+    that was not recorded raises KeyError, without touching the network.
+    """
+
+    def __init__(self, path, replay=False):
+        self.path = path
+        self.replay = replay
+        self.responses = {}
+        if replay or os.path.exists(path):
+            with gzip.open(path, 'rt', encoding='utf-8') as snapshot:
+                self.responses = json.load(snapshot)['responses']
+
+    @staticmethod
+    def key(scope, operation, args, kwargs):
+        return json.dumps([scope, operation, args, kwargs], sort_keys=True, default=list)
+
+    def get(self, key):
+        try:
+            return copy.deepcopy(self.responses[key])
+        except KeyError:
+            raise KeyError(f'Response not found in snapshot {self.path}: {key}') from None
+
+    def put(self, key, response):
+        self.responses[key] = copy.deepcopy(response)
+
+    def save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=directory)
+        try:
+            # GzipFile leaves a fileobj passed to it open, so the raw file is closed separately
+            with os.fdopen(fd, 'wb') as raw, gzip.open(raw, 'wt', encoding='utf-8') as snapshot:
+                json.dump({'version': 1, 'responses': self.responses}, snapshot)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
 
 
 class GetMerakiConfig:
@@ -9,17 +219,37 @@ class GetMerakiConfig:
     network = ['']
     productType = []
 
-    def __init__(self, api, organization_name=''):
+    def __init__(self, api, organization_name='', concurrency=None, cache_ttl=300,
+                 snapshot=None, replay=False, rate_limit=DEFAULT_RATE_LIMIT, org_rate_limits=None):
         """
         Structure the output to be used by docxtpl returning in list or dictionary
         :param api: API Token from your Meraki user
         :param organization_name: The oganization Name that you want to extract the information
+        :param concurrency: When set, per-network calls are made concurrently with
+            meraki.aio.AsyncDashboardAPI, with at most this many requests in flight
+        :param cache_ttl: Seconds an API response is reused by later calls of this run
+        :param snapshot: Path of a SnapshotStore file (.json.gz). Responses are recorded
+            to it (call save_snapshot at the end), or served from it when replay=True
+        :param replay: Serve every response from the snapshot, with no network access
+        :param rate_limit: Requests per second sent to each organization
+        :param org_rate_limits: Per-organization overrides of rate_limit, by organization ID
         """
         self.api = str(api)
-        self.dashboard = meraki.DashboardAPI(self.api)
+        self.concurrency = concurrency
+        self.cache = ResponseCache(cache_ttl)
+        self.snapshot = SnapshotStore(snapshot, replay) if snapshot else None
+        self.replay = bool(self.snapshot and replay)
+        self.rate_limit = rate_limit
+        self.org_rate_limits = org_rate_limits or {}
+        self.limiters = {}
+        # 429s are handled by the RateLimiter (Retry-After) instead of the SDK's own retry sleeps
+        self.dashboard = None if self.replay else meraki.DashboardAPI(self.api, wait_on_rate_limit=False)
+        # Network objects from getOrganizationNetworks, by network ID
+        self.network_details = {}
+        self.productType = []
 
     ## Get organization ID from name
-        organizations_json = self.dashboard.organizations.getOrganizations()
+        organizations_json = self.call('organizations', 'getOrganizations')
         org_list = []
         for item in organizations_json:
             if organization_name == item['name']:
@@ -32,14 +262,112 @@ class GetMerakiConfig:
         self.organization = org_list
 
 
+    def call(self, scope, operation, *args, **kwargs):
+        """
+        Call a Dashboard API endpoint (ex.: call('networks', 'getNetwork', network_id))
+        through the response cache, so each distinct call is made once per run
+        """
+        key = self.cache.key(scope, operation, args, kwargs)
+        hit, response = self.cache.get(key)
+        if hit:
+            return response
+        if self.replay:
+            response = self.snapshot.get(self.snapshot.key(scope, operation, args, kwargs))
+        else:
+            limiter = self.limiter_for(scope, args)
+            for attempt in range(MAX_THROTTLE_RETRIES + 1):
+                limiter.acquire()
+                try:
+                    response = getattr(getattr(self.dashboard, scope), operation)(*args, **kwargs)
+                    break
+                except API_ERRORS as error:
+                    wait = retry_after(error)
+                    if wait is None or attempt == MAX_THROTTLE_RETRIES:
+                        raise
+                    limiter.pause(wait)
+            if self.snapshot:
+                self.snapshot.put(self.snapshot.key(scope, operation, args, kwargs), response)
+        self.cache.put(key, response)
+        return response
+
+    async def call_async(self, dashboard, scope, operation, *args, **kwargs):
+        """ Same as call, using an open meraki.aio.AsyncDashboardAPI """
+        key = self.cache.key(scope, operation, args, kwargs)
+        hit, response = self.cache.get(key)
+        if hit:
+            return response
+        if self.replay:
+            response = self.snapshot.get(self.snapshot.key(scope, operation, args, kwargs))
+        else:
+            limiter = self.limiter_for(scope, args)
+            priority = CALL_PRIORITY.get(operation, DEFAULT_PRIORITY)
+            for attempt in range(MAX_THROTTLE_RETRIES + 1):
+                await limiter.acquire_async(priority)
+                try:
+                    response = await getattr(getattr(dashboard, scope), operation)(*args, **kwargs)
+                    break
+                except API_ERRORS as error:
+                    wait = retry_after(error)
+                    if wait is None or attempt == MAX_THROTTLE_RETRIES:
+                        raise
+                    limiter.pause(wait)
+            if self.snapshot:
+                self.snapshot.put(self.snapshot.key(scope, operation, args, kwargs), response)
+        self.cache.put(key, response)
+        return response
+
+    def limiter_for(self, scope, args):
+        """ RateLimiter of the organization a call is charged to """
+        org_id = None
+        if scope == 'organizations' and args:
+            org_id = args[0]
+        elif args and args[0] in self.network_details:
+            org_id = self.network_details[args[0]].get('organizationId')
+        if org_id is None:
+            # getOrganizations, or a network not listed: charged to the first organization
+            org_id = list(self.organization[0].values())[0] if self.organization != [''] else ''
+        limiter = self.limiters.get(org_id)
+        if limiter is None:
+            # setdefault keeps a single limiter per organization when called from several threads
+            limiter = self.limiters.setdefault(
+                org_id, RateLimiter(self.org_rate_limits.get(org_id, self.rate_limit)))
+        return limiter
+
+    def rate_report(self):
+        lines = []
+        for org_id, limiter in self.limiters.items():
+            stats = limiter.stats()
+            lines.append(f"API rate [{org_id or 'default'}]: {stats['requests']} requests, "
+                         f"{stats['throughput']:.1f} req/s, {stats['throttled']} throttled (429), "
+                         f"{stats['waited']:.1f}s waiting for the rate limit")
+        return '\n'.join(lines)
+
+    def async_dashboard(self):
+        """ meraki.aio.AsyncDashboardAPI for call_async (nothing to open when replaying) """
+        if self.replay:
+            return contextlib.nullcontext()
+        return meraki.aio.AsyncDashboardAPI(self.api, maximum_concurrent_requests=self.concurrency,
+                                            wait_on_rate_limit=False)
+
+    def save_snapshot(self):
+        """ Write the recorded responses to the snapshot file """
+        if self.snapshot and not self.replay:
+            self.snapshot.save()
+
+    def cache_report(self):
+        stats = self.cache.stats()
+        return f"API cache: {stats['hits']} hits, {stats['misses']} misses ({stats['entries']} distinct calls)"
+
     #Get Organization ID from name or from Organization
     def get_network_list(self, network_name = ''):
         network_list = []
         for item in self.organization:
-            network = self.dashboard.organizations.getOrganizationNetworks(
-                list(item.values())[0], total_pages='all'
+            network = self.call(
+                'organizations', 'getOrganizationNetworks', list(item.values())[0], total_pages='all',
+                perPage=NETWORKS_PER_PAGE
             )
             for json_file in network:
+                self.network_details[json_file['id']] = json_file
                 if network_name == json_file['name']:
                     network_dict = {json_file['name']: json_file['id']}
                     network_list = [network_dict]
@@ -62,13 +390,22 @@ class GetMerakiConfig:
 
     def get_devices(self):
         devices = []
+        networks = self.get_network_array()
         #get devices for each network in self.network
         for org in self.organization:
             org = list(org.values())[0]
-            devices.append(self.dashboard.organizations.getOrganizationDevices(
-                org, total_pages='all', networkIds=self.get_network_array() )
+            # only the networks of this organization
+            org_networks = [network for network in networks
+                            if self.network_details.get(network, {}).get('organizationId', org) == org]
+            # an empty networkIds filter is dropped by the API and would list
+            # every device of the organization
+            if not org_networks:
+                continue
+            devices.extend(self.call(
+                'organizations', 'getOrganizationDevices', org, total_pages='all', perPage=DEVICES_PER_PAGE,
+                networkIds=org_networks )
             )
-        return devices[0]
+        return devices
 
     def get_product_types(self, device_list=''):
         if device_list == '':
@@ -82,15 +419,84 @@ class GetMerakiConfig:
         # self.productType = self.productType.sort()
         return self.productType
 
+    def for_organization(self, organization):
+        """
+        View of this report restricted to one organization ({name: id}). It shares
+        the dashboard session, response cache, snapshot and rate limiters.
+        """
+        report = copy.copy(self)
+        report.organization = [organization]
+        report.network = ['']
+        report.productType = []
+        return report
+
+    def collect(self, network_name=''):
+        """ Everything the template needs from the organizations of this report """
+        self.get_network_list(network_name)
+        device_list = self.get_devices()
+        self.get_product_types(device_list)
+        return {
+            'organization': ', '.join(name for org in self.organization for name in org),
+            'productType': list(set(self.productType)),
+            'device_list': device_list,
+            'wireless_settings': self.get_wireless_setting(),
+            'ssids': self.get_ssid(),
+        }
+
+    def collect_organizations(self, network_name='', workers=None):
+        """
+        collect() for each organization at the same time, one thread per
+        organization (each with its own rate limiter)
+        :return: List of per-organization contexts, in organization order
+        """
+        reports = [self.for_organization(org) for org in self.organization]
+        with ThreadPoolExecutor(max_workers=workers or len(reports) or 1) as executor:
+            return list(executor.map(lambda report: report.collect(network_name), reports))
+
+    def get_wireless_networks(self, operation):
+        """
+        Fetch every network and, for the wireless ones, the per-network wireless
+        endpoint ``operation`` (ex.: 'getNetworkWirelessSsids'). Networks already
+        listed by get_network_list are not fetched again; the Dashboard API has no
+        organization-wide equivalent of the wireless settings and SSID endpoints,
+        so those remain one call per wireless network.
+        :return: List of (network, response) tuples, in network order
+        """
+        networks = self.get_network_array()
+        if self.concurrency:
+            return asyncio.run(self._get_wireless_networks_async(networks, operation))
+
+        wireless_networks = []
+        for network in networks:
+            network_json = self.network_details.get(network) or self.call('networks', 'getNetwork', network)
+            if 'wireless' in network_json['productTypes']:
+                wireless_networks.append((network_json, self.call('wireless', operation, network)))
+        return wireless_networks
+
+    async def _get_wireless_networks_async(self, networks, operation):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        async with self.async_dashboard() as dashboard:
+
+            async def fetch(network):
+                async with semaphore:
+                    network_json = self.network_details.get(network)
+                    if network_json is None:
+                        network_json = await self.call_async(dashboard, 'networks', 'getNetwork', network)
+                    if 'wireless' not in network_json['productTypes']:
+                        return None
+                    return network_json, await self.call_async(dashboard, 'wireless', operation, network)
+
+            # gather keeps the results in the same order as the networks
+            results = await asyncio.gather(*(fetch(network) for network in networks))
+        return [result for result in results if result is not None]
+
     def get_wireless_setting(self):
 
         network_settings = []
 
-        for network in self.get_network_array():
-            network_json = self.dashboard.networks.getNetwork(network)
-            if 'wireless' in network_json['productTypes']:
-                network_settings.append(self.dashboard.wireless.getNetworkWirelessSettings(network))
-                network_settings[-1]['network'] = network_json['name']
+        for network_json, settings in self.get_wireless_networks('getNetworkWirelessSettings'):
+            network_settings.append(settings)
+            network_settings[-1]['network'] = network_json['name']
         if not network_settings:
             return [{'meshingEnabled': 'Not Supported',
                      'ipv6BridgeEnabled': 'Not Supported',
@@ -113,91 +519,84 @@ class GetMerakiConfig:
 
     def get_ssid(self):
         ssids = []
-        for network in self.get_network_array():
-            network_json = self.dashboard.networks.getNetwork(network)
+        for network_json, ssids_setting in self.get_wireless_networks('getNetworkWirelessSsids'):
+            for ssid_setting in ssids_setting:
+                if ssid_setting['enabled']:
+                    # Create a Dict with important info
+                    ssid_values = {
+                        'name': ssid_setting['name'],
+                        'bandSelection': ssid_setting['bandSelection'],
+                        'availabilityTags': ssid_setting['availabilityTags'],
+                        'authMode': ssid_setting['authMode'],
+                        'minBitrate': ssid_setting['minBitrate']
+                    }
 
-            if 'wireless' in network_json['productTypes']:
-                ssids_setting = self.dashboard.wireless.getNetworkWirelessSsids(network_json['id'])
-                
-                for ssid_setting in ssids_setting:
-                    if ssid_setting['enabled']:
-                        # Create a Dict with important info
-                        ssid_values = {
-                            'name': ssid_setting['name'],
-                            'bandSelection': ssid_setting['bandSelection'],
-                            'availabilityTags': ssid_setting['availabilityTags'],
-                            'authMode': ssid_setting['authMode'],
-                            'minBitrate': ssid_setting['minBitrate']
-                        }
-
-                        # Get the Auth Config values Value in one key
-                        if ssid_setting['authMode'] == 'psk':
-                            ssid_values['authValue'] = ssid_setting['psk']
-
-
-                        elif ssid_setting['authMode'] == '8021x-radius':
-                            servers = 'Radius Auth:\n'
-                            for server in ssid_setting['radiusServers']:
-                                servers += f'{server['host']}:{server['port']}\n'
-
-                            servers += 'Accounting:\n'
-
-
-                            for server in ssid_setting['radiusAccountingServers']:
-                                servers += f'{server['host']}:{server['port']}\n'
-
-                            ssid_values['authValue'] = servers
-
-
-                        elif ssid_setting['authMode'] == '8021x-meraki':
-                            ssid_values['authValue'] = 'System Manager'
-                        elif ssid_setting['authMode'] == 'open':
-                            if ssid_setting['splashPage'] == 'Sponsored guest':
-                                ssid_values['authValue'] = f'Sponsor e-mail:\n{ssid_setting['splashGuestSponsorDomains']}'
-                            elif ssid_setting['authMode'] == 'Click-through splash page':
-                                ssid_values['authValue'] = f'External Portal: \n{ssid_setting['adminSplashUrl']}'
-                            else:
-                                ssid_values['authValue'] = 'Open'
-                        else:
-                            ssid_values['authValue'] = ssid_setting['authMode']
-        
-                        # Encrypt Algorithm
-                        if ssid_setting['authMode'] != 'open':
-                            ssid_values['wpaEncryptionMode'] = ssid_setting['wpaEncryptionMode']
-
-                            # Get the PMF Value in one key
-                            if ssid_setting['dot11w']['enabled'] and ssid_setting['dot11w']['required']:
-                                ssid_values['dot11w'] = 'Required'
-                            elif ssid_setting['dot11w']['enabled']:
-                                ssid_values['dot11w'] = 'Enabled'
-                            else:
-                                ssid_values['dot11w'] = 'Disabled'
-
-                            # Get the FastRoaming Value in one key
-                            if ssid_setting['dot11r']['enabled'] and ssid_setting['dot11r']['adaptive']:
-                                ssid_values['dot11r'] = 'Adaptive'
-                            elif ssid_setting['dot11r']['enabled']:
-                                ssid_values['dot11r'] = 'Enabled'
-                            else:
-                                ssid_values['dot11r'] = 'Disabled'
+                    # Get the Auth Config values Value in one key
+                    if ssid_setting['authMode'] == 'psk':
+                        ssid_values['authValue'] = ssid_setting['psk']
 
-                        else:
-                            ssid_values['wpaEncryptionMode'] = ssid_setting['authMode']
-                            ssid_values['dot11r'] = 'Not Required'
-                            ssid_values['dot11w'] = 'Not Required'
 
-                        # Get VLAN
-                        if ssid_setting['useVlanTagging']:
-                            ssid_values['defaultVlanId'] = ssid_setting['defaultVlanId']
+                    elif ssid_setting['authMode'] == '8021x-radius':
+                        servers = 'Radius Auth:\n'
+                        for server in ssid_setting['radiusServers']:
+                            servers += f'{server['host']}:{server['port']}\n'
+
+                        servers += 'Accounting:\n'
+
+
+                        for server in ssid_setting['radiusAccountingServers']:
+                            servers += f'{server['host']}:{server['port']}\n'
+
+                        ssid_values['authValue'] = servers
+
+
+                    elif ssid_setting['authMode'] == '8021x-meraki':
+                        ssid_values['authValue'] = 'System Manager'
+                    elif ssid_setting['authMode'] == 'open':
+                        if ssid_setting['splashPage'] == 'Sponsored guest':
+                            ssid_values['authValue'] = f'Sponsor e-mail:\n{ssid_setting['splashGuestSponsorDomains']}'
+                        elif ssid_setting['authMode'] == 'Click-through splash page':
+                            ssid_values['authValue'] = f'External Portal: \n{ssid_setting['adminSplashUrl']}'
                         else:
-                            ssid_values['defaultVlanId'] = 'Meraki NAT'
+                            ssid_values['authValue'] = 'Open'
+                    else:
+                        ssid_values['authValue'] = ssid_setting['authMode']
+    
+                    # Encrypt Algorithm
+                    if ssid_setting['authMode'] != 'open':
+                        ssid_values['wpaEncryptionMode'] = ssid_setting['wpaEncryptionMode']
+
+                        # Get the PMF Value in one key
+                        if ssid_setting['dot11w']['enabled'] and ssid_setting['dot11w']['required']:
+                            ssid_values['dot11w'] = 'Required'
+                        elif ssid_setting['dot11w']['enabled']:
+                            ssid_values['dot11w'] = 'Enabled'
+                        else:
+                            ssid_values['dot11w'] = 'Disabled'
 
+                        # Get the FastRoaming Value in one key
+                        if ssid_setting['dot11r']['enabled'] and ssid_setting['dot11r']['adaptive']:
+                            ssid_values['dot11r'] = 'Adaptive'
+                        elif ssid_setting['dot11r']['enabled']:
+                            ssid_values['dot11r'] = 'Enabled'
+                        else:
+                            ssid_values['dot11r'] = 'Disabled'
 
-                        ssids.append(ssid_values)
+                    else:
+                        ssid_values['wpaEncryptionMode'] = ssid_setting['authMode']
+                        ssid_values['dot11r'] = 'Not Required'
+                        ssid_values['dot11w'] = 'Not Required'
 
+                    # Get VLAN
+                    if ssid_setting['useVlanTagging']:
+                        ssid_values['defaultVlanId'] = ssid_setting['defaultVlanId']
                     else:
-                        pass
-            else:
-                pass
+                        ssid_values['defaultVlanId'] = 'Meraki NAT'
+
+
+                    ssids.append(ssid_values)
+
+                else:
+                    pass
 
         return ssids
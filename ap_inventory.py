@@ -0,0 +1,104 @@
+"""Armazenamento compacto do inventário de APs.
+
+Controladoras grandes têm milhares de APs, e guardar cada um como um dict de
+10 chaves custa caro. O APInventory guarda os campos em colunas. Os campos de
+baixa cardinalidade (modelo, versão, modo, country code...) viram códigos num
+array('I'), apontando para uma tabela de valores distintos. Para quem consome,
+ele continua se comportando como a lista de dicts de antes: iterar, indexar e
+len() devolvem os mesmos dicts, montados sob demanda.
+"""
+from array import array
+
+# Campos de cada AP, na ordem das chaves dos dicts devolvidos
+AP_FIELDS = (
+    'ap_name',
+    'country_code',
+    'ip_config',
+    'ip_address',
+    'ip_netmask',
+    'gateway_ip',
+    'ap_mode',
+    'software_version',
+    'ap_model',
+    'ap_user_name',
+)
+
+# Campos únicos por AP, guardados como listas de str; os demais são codificados
+UNIQUE_FIELDS = frozenset(('ap_name', 'ip_address'))
+
+
+class APInventory:
+    """Sequência de APs em colunas, com valores repetidos guardados uma única vez."""
+
+    __slots__ = ('_columns', '_values', '_codes')
+
+    def __init__(self, records=()):
+        self._columns = [[] if field in UNIQUE_FIELDS else array('I') for field in AP_FIELDS]
+        # Tabela de valores distintos (compartilhada pelos campos codificados)
+        self._values = []
+        self._codes = {}
+        for record in records:
+            self.append(*(record[field] for field in AP_FIELDS))
+
+    def append(self, *values):
+        """Adiciona um AP; ``values`` segue a ordem de AP_FIELDS."""
+        codes = self._codes
+        for column, value in zip(self._columns, values):
+            if isinstance(column, list):
+                column.append(value)
+                continue
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(self._values)
+                self._values.append(value)
+            column.append(code)
+
+    def _record(self, index):
+        values = self._values
+        return {
+            field: column[index] if isinstance(column, list) else values[column[index]]
+            for field, column in zip(AP_FIELDS, self._columns)
+        }
+
+    def column(self, field):
+        """Todos os valores de um campo, na ordem dos APs."""
+        column = self._columns[AP_FIELDS.index(field)]
+        if isinstance(column, list):
+            return list(column)
+        values = self._values
+        return [values[code] for code in column]
+
+    def __len__(self):
+        return len(self._columns[0])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._record(index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._record(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('AP index out of range')
+        return self._record(index)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __eq__(self, other):
+        if isinstance(other, (APInventory, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f'<APInventory: {len(self)} APs>'
+
+    def __getstate__(self):
+        # Sem __dict__ por causa dos __slots__; o índice de códigos é refeito
+        return self._columns, self._values
+
+    def __setstate__(self, state):
+        self._columns, self._values = state
+        self._codes = {value: code for code, value in enumerate(self._values)}
@@ -0,0 +1,153 @@
+"""Geração de LLDs em lote, sem interface gráfica.
+
+Uso:
+    python -m batch SHOW_TECHS... --template LLD_Template.docx [--output-dir DIR] [--jobs N]
+
+Cada entrada pode ser um arquivo, um diretório (arquivos que casam com
+--pattern) ou um glob. Os documentos são gerados em paralelo e cada um é
+gravado de forma atômica em DIR/<nome do show tech>_AsBuilt_LLD.docx.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from extract_cache import DEFAULT_MAX_BYTES, ContextCache
+
+OUTPUT_SUFFIX = '_AsBuilt_LLD.docx'
+
+
+def find_inputs(entries, pattern):
+    # Expande arquivos, diretórios e globs, sem repetir o mesmo arquivo
+    inputs = []
+    seen = set()
+    for entry in entries:
+        if os.path.isdir(entry):
+            paths = sorted(glob.glob(os.path.join(entry, pattern)))
+        elif os.path.exists(entry):
+            paths = [entry]
+        else:
+            paths = sorted(glob.glob(entry))
+        for path in paths:
+            key = os.path.realpath(path)
+            if os.path.isfile(path) and key not in seen:
+                seen.add(key)
+                inputs.append(path)
+    return inputs
+
+
+def output_paths(inputs, output_dir):
+    # Um destino por entrada; nomes repetidos (mesmo arquivo em diretórios
+    # diferentes) recebem um sufixo numérico para não se sobrescreverem
+    used = set()
+    paths = []
+    for path in inputs:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        candidate = os.path.join(output_dir, f'{stem}{OUTPUT_SUFFIX}')
+        counter = 2
+        while os.path.normcase(candidate) in used:
+            candidate = os.path.join(output_dir, f'{stem}_{counter}{OUTPUT_SUFFIX}')
+            counter += 1
+        used.add(os.path.normcase(candidate))
+        paths.append(candidate)
+    return paths
+
+
+def render(show_tech_path, template_path, output_path, extract_workers=None, cache_options=None,
+           profile=None):
+    start = time.perf_counter()
+    try:
+        # Importado aqui para que a interface possa usar este módulo sem
+        # carregar o parser e o docxtpl antes de abrir a janela
+        import script
+        cache = ContextCache(*cache_options) if cache_options else None
+        script.cisco_built_generator(show_tech_path, template_path,
+                                     workers=extract_workers,
+                                     output_path=output_path,
+                                     cache=cache,
+                                     profile=profile)
+    except Exception:
+        error = traceback.format_exc(limit=1).strip().splitlines()[-1]
+        return show_tech_path, output_path, 'FAILED', time.perf_counter() - start, error
+    return show_tech_path, output_path, 'OK', time.perf_counter() - start, ''
+
+
+def run(inputs, template_path, output_dir, jobs=None, extract_workers=None, cache_options=None,
+        profile=None):
+    os.makedirs(output_dir, exist_ok=True)
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        # futuro -> (show tech, documento), para registrar a falha de um
+        # processo que morreu (ex.: sem memória) sem devolver resultado
+        futures = {executor.submit(render, path, template_path, output,
+                                   extract_workers, cache_options, profile): (path, output)
+                   for path, output in zip(inputs, output_paths(inputs, output_dir))}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as error:
+                # BrokenProcessPool derruba também os arquivos ainda na fila;
+                # cada um sai como FAILED e os demais resultados são mantidos
+                path, output = futures[future]
+                result = (path, output, 'FAILED', time.perf_counter() - start,
+                          f'{type(error).__name__}: {error}')
+            print_result(result)
+            results.append(result)
+    return results
+
+
+def print_result(result):
+    show_tech_path, output_path, status, elapsed, error = result
+    detail = error if error else output_path
+    print(f'{status:<6} {elapsed:8.2f}s  {show_tech_path} -> {detail}', flush=True)
+
+
+def print_summary(results, elapsed):
+    failed = [result for result in results if result[2] != 'OK']
+    print()
+    print(f'{len(results)} arquivo(s) em {elapsed:.2f}s: '
+          f'{len(results) - len(failed)} ok, {len(failed)} com falha')
+    for show_tech_path, _, _, _, error in failed:
+        print(f'  {show_tech_path}: {error}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m batch',
+                                     description='Gera LLDs de WLC9800 em lote a partir de arquivos show tech.')
+    parser.add_argument('inputs', nargs='+', help='arquivos, diretórios ou globs de show tech')
+    parser.add_argument('-t', '--template', required=True, help='template .docx')
+    parser.add_argument('-o', '--output-dir', default='.', help='diretório de saída (padrão: diretório atual)')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                        help='documentos gerados em paralelo (padrão: número de CPUs)')
+    parser.add_argument('--extract-workers', type=int, default=None,
+                        help='processos de extração por documento (padrão: sequencial)')
+    parser.add_argument('--cache-dir', default=None,
+                        help='guarda os dados extraídos neste diretório e os reaproveita '
+                             'quando o mesmo show tech é gerado de novo')
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help='tamanho máximo do cache em MB (padrão: %(default)s)')
+    parser.add_argument('--pattern', default='*.txt',
+                        help='arquivos considerados dentro de diretórios (padrão: *.txt)')
+    parser.add_argument('--profile', action='store_true', default=None,
+                        help='grava <documento>.profile.json com o tempo e a memória de cada etapa '
+                             '(o mesmo que LLD_PROFILE=1)')
+    args = parser.parse_args(argv)
+
+    inputs = find_inputs(args.inputs, args.pattern)
+    if not inputs:
+        parser.error('nenhum arquivo show tech encontrado')
+
+    start = time.perf_counter()
+    cache_options = (args.cache_dir, args.cache_size * 1024 * 1024) if args.cache_dir else None
+    results = run(inputs, args.template, args.output_dir, args.jobs,
+                  args.extract_workers, cache_options, args.profile)
+    print_summary(results, time.perf_counter() - start)
+    return 1 if any(result[2] != 'OK' for result in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
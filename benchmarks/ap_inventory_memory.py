@@ -0,0 +1,87 @@
+"""Benchmark de memória do inventário de APs: lista de dicts x APInventory.
+
+Uso (a partir da raiz do projeto):
+    python benchmarks/ap_inventory_memory.py [--aps 6000]
+
+Monta o mesmo inventário sintético nas duas representações e mede, com
+tracemalloc, a memória retida por cada uma e o tempo de um gc.collect()
+completo com ela viva.
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ap_inventory import AP_FIELDS, APInventory  # noqa: E402
+
+MODELS = ('C9120AXI-B', 'C9130AXI-B', 'C9136I-B', 'C9166I-B')
+VERSIONS = ('17.9.4.27', '17.9.5.47', '17.12.3.20')
+MODES = ('Local', 'FlexConnect', 'Monitor')
+
+
+def ap_values(index):
+    # Strings novas a cada AP, como as que o parser decodifica do show tech
+    return (
+        f'AP{index:05d}',
+        ''.join(('BR', '')),
+        ''.join(('DHCP', '')),
+        f'10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}',
+        ''.join(('255.255.255.0', '')),
+        ''.join(('10.0.0.1', '')),
+        ''.join((MODES[index % len(MODES)], '')),
+        ''.join((VERSIONS[index % len(VERSIONS)], '')),
+        ''.join((MODELS[index % len(MODELS)], '')),
+        ''.join(('admin', '')),
+    )
+
+
+def build_dicts(count):
+    return [dict(zip(AP_FIELDS, ap_values(index))) for index in range(count)]
+
+
+def build_store(count):
+    store = APInventory()
+    for index in range(count):
+        store.append(*ap_values(index))
+    return store
+
+
+def measure(builder, count):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    inventory = builder(count)
+    build_time = time.perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    gc.collect()
+    gc_time = time.perf_counter() - start
+    return inventory, retained, build_time, gc_time
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--aps', type=int, default=6000, help='quantidade de APs (padrão: 6000)')
+    args = parser.parse_args(argv)
+
+    dicts, dict_bytes, dict_build, dict_gc = measure(build_dicts, args.aps)
+    store, store_bytes, store_build, store_gc = measure(build_store, args.aps)
+    assert store == dicts
+
+    print(f'{args.aps} APs')
+    print(f'{"representação":<16} {"memória":>12} {"montagem":>10} {"gc.collect":>11}')
+    for name, retained, build_time, gc_time in (
+            ('lista de dicts', dict_bytes, dict_build, dict_gc),
+            ('APInventory', store_bytes, store_build, store_gc)):
+        print(f'{name:<16} {retained / 1024:>9.0f} KB {build_time * 1000:>7.1f} ms {gc_time * 1000:>8.1f} ms')
+    print(f'redução de memória: {dict_bytes / store_bytes:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Verifica que os extratores dão o mesmo resultado com quebras de linha LF e CRLF.
+
+Uso (a partir da raiz do projeto):
+    python benchmarks/line_endings.py [show_tech.txt ...] [--aps 100]
+
+Show techs capturados num terminal do Windows chegam com CRLF, e o
+ShowTechWireless lê o arquivo em bytes, sem a conversão de quebras de linha
+do modo texto. Para cada arquivo informado (e para um show tech sintético
+com --aps APs) o script grava uma cópia LF e outra CRLF, executa todos os
+get_* nas duas e lista os extratores cuja saída mudou. Termina com código 1
+se houver alguma diferença.
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from show_tech import ShowTechWireless  # noqa: E402
+from synthetic_show_tech import write_show_tech  # noqa: E402
+
+EXTRACTORS = tuple(sorted(name for name in dir(ShowTechWireless) if name.startswith('get_')))
+
+
+def extract_all(path):
+    with ShowTechWireless.from_path(path) as show_tech:
+        return {name: getattr(show_tech, name)() for name in EXTRACTORS}
+
+
+def compare(source, directory):
+    """Nomes dos extratores com saídas diferentes entre as cópias LF e CRLF de ``source``."""
+    with open(source, 'rb') as show_tech_file:
+        lf = show_tech_file.read().replace(b'\r\n', b'\n')
+    paths = {}
+    for name, data in (('lf', lf), ('crlf', lf.replace(b'\n', b'\r\n'))):
+        paths[name] = os.path.join(directory, f'{name}.txt')
+        with open(paths[name], 'wb') as output:
+            output.write(data)
+    lf_results = extract_all(paths['lf'])
+    crlf_results = extract_all(paths['crlf'])
+    return [name for name in EXTRACTORS if lf_results[name] != crlf_results[name]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='*', help='show techs a verificar, além do sintético')
+    parser.add_argument('--aps', type=int, default=100, help='APs do show tech sintético (padrão: 100)')
+    args = parser.parse_args(argv)
+
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        synthetic = write_show_tech(os.path.join(directory, 'synthetic.txt'), args.aps)
+        for path in [synthetic, *args.paths]:
+            label = f'sintético ({args.aps} APs)' if path == synthetic else path
+            differences = compare(path, directory)
+            if differences:
+                failed = True
+                print(f'{label}: saída diferente com CRLF em {", ".join(differences)}')
+            else:
+                print(f'{label}: {len(EXTRACTORS)} extratores iguais com LF e CRLF')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""Benchmark de escala do parser e da geração do documento Cisco.
+
+Uso (a partir da raiz do projeto):
+    python benchmarks/scaling.py [--aps 10 100 1000 10000] [--repeat 3] [--baseline arquivo.json]
+
+Para cada ponto de escala gera um show tech sintético
+(benchmarks/synthetic_show_tech.py), mede o melhor tempo de cada extrator do
+ShowTechWireless e da geração completa (script.cisco_built_generator) e grava
+os resultados em benchmarks/results/scaling-<data>.json. Os tempos são
+comparados com a execução anterior (ou com --baseline) e o que ficou mais
+lento que o limite de --threshold aparece como regressão no relatório.
+"""
+import argparse
+import datetime
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from show_tech import ShowTechWireless  # noqa: E402
+from synthetic_show_tech import default_counts, write_show_tech  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+DEFAULT_SCALES = (10, 100, 1000, 10000)
+DEFAULT_TEMPLATE = os.path.join(ROOT, 'LLD_Template.docx')
+# Diferenças abaixo disso são ruído, mesmo que a razão passe do limite
+MIN_DIFFERENCE = 0.002
+
+EXTRACTORS = tuple(sorted(name for name in dir(ShowTechWireless) if name.startswith('get_')))
+
+
+def best_time(function, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def load(path):
+    # Abertura do arquivo mais o índice de seções, feito sob demanda no primeiro extrator
+    with ShowTechWireless.from_path(path) as show_tech:
+        show_tech.sections
+
+
+def time_extractors(path, repeat):
+    timings = {'load': best_time(lambda: load(path), repeat)}
+    for name in EXTRACTORS:
+        best = None
+        for _ in range(repeat):
+            # Objeto novo a cada repetição; só o extrator entra na medida
+            with ShowTechWireless.from_path(path) as show_tech:
+                show_tech.sections
+                extractor = getattr(show_tech, name)
+                start = time.perf_counter()
+                extractor()
+                elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings[name] = best
+    return timings
+
+
+def time_generator(path, template, directory, repeat):
+    import script
+    output = os.path.join(directory, 'AsBuilt_LLD.docx')
+    return best_time(lambda: script.cisco_built_generator(path, template, output_path=output), repeat)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scales, repeat, template):
+    results = {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'scales': {},
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for aps in scales:
+            path = write_show_tech(os.path.join(directory, f'show_tech_{aps}.txt'), aps)
+            timings = time_extractors(path, repeat)
+            if template:
+                timings['cisco_built_generator'] = time_generator(path, template, directory, repeat)
+            results['scales'][str(aps)] = {
+                'counts': default_counts(aps),
+                'file_bytes': os.path.getsize(path),
+                'seconds': timings,
+            }
+            print(f'{aps} APs: {sum(timings.values()):.3f}s', flush=True)
+    return results
+
+
+def latest_result():
+    paths = sorted(glob.glob(os.path.join(RESULTS_DIR, 'scaling-*.json')))
+    return paths[-1] if paths else None
+
+
+def save(results):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+    path = os.path.join(RESULTS_DIR, f'scaling-{stamp}.json')
+    with open(path, 'w', encoding='utf-8') as output:
+        json.dump(results, output, indent=2)
+    return path
+
+
+def report(results, baseline=None, threshold=0.2):
+    """Imprime a tabela de tempos e devolve a lista de regressões em relação a ``baseline``."""
+    regressions = []
+    for aps, scale in results['scales'].items():
+        previous = (baseline or {}).get('scales', {}).get(aps, {}).get('seconds', {})
+        print()
+        print(f'{aps} APs ({scale["file_bytes"] / 1024:.0f} KB)')
+        print(f'  {"etapa":<24} {"tempo":>10} {"anterior":>10} {"razão":>7}')
+        for stage, seconds in scale['seconds'].items():
+            line = f'  {stage:<24} {seconds * 1000:>7.1f} ms'
+            before = previous.get(stage)
+            if before:
+                ratio = seconds / before
+                line += f' {before * 1000:>7.1f} ms {ratio:>6.2f}x'
+                if ratio > 1 + threshold and seconds - before > MIN_DIFFERENCE:
+                    line += '  REGRESSÃO'
+                    regressions.append((aps, stage, before, seconds))
+            print(line)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--aps', type=int, nargs='+', default=list(DEFAULT_SCALES),
+                        help='pontos de escala em quantidade de APs (padrão: 10 100 1000 10000)')
+    parser.add_argument('--repeat', type=int, default=3, help='repetições por medida; vale a melhor (padrão: 3)')
+    parser.add_argument('--template', default=DEFAULT_TEMPLATE,
+                        help='template da geração completa (padrão: LLD_Template.docx)')
+    parser.add_argument('--no-generator', action='store_true',
+                        help='mede só os extratores, sem cisco_built_generator')
+    parser.add_argument('--baseline', help='resultado anterior para comparar (padrão: o mais recente)')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='aumento relativo considerado regressão (padrão: 0.2 = 20%%)')
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help='termina com código 1 se houver regressão')
+    args = parser.parse_args(argv)
+
+    baseline_path = args.baseline or latest_result()
+    baseline = None
+    if baseline_path:
+        with open(baseline_path, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+
+    results = run(args.aps, args.repeat, None if args.no_generator else args.template)
+    path = save(results)
+    regressions = report(results, baseline, args.threshold)
+
+    print()
+    print(f'resultados gravados em {path}')
+    if baseline_path:
+        print(f'comparados com {baseline_path}: {len(regressions)} regressão(ões)')
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
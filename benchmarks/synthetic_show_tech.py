@@ -0,0 +1,267 @@
+"""Gerador de show tech wireless sintético de uma WLC 9800.
+
+Uso (a partir da raiz do projeto):
+    python benchmarks/synthetic_show_tech.py saida.txt --aps 1000 [--wlans 8 ...]
+
+Produz as seções lidas pelo ShowTechWireless (running-config, tags, profiles,
+ACLs, inventário de APs...) com quantidades ajustáveis e nenhum dado real:
+nomes, endereços e chaves são inventados a partir de uma semente, então a
+mesma chamada gera sempre o mesmo arquivo.
+"""
+import argparse
+import random
+
+SEPARATOR = '------------------ {} ------------------\n'
+
+AP_MODELS = ('C9120AXI-B', 'C9130AXI-B', 'C9136I-B', 'C9166I-B', 'C9105AXI-B')
+AP_VERSIONS = ('17.9.4.27', '17.9.5.47', '17.12.3.20')
+AP_MODES = ('Local', 'Local', 'Local', 'FlexConnect', 'Monitor')
+RF_BANDS = (('24ghz', '2.4ghz', '24'), ('5ghz', '5ghz', '5'), ('6ghz', '6ghz', '6'))
+POLICY_FILLER = ('Passive Client', 'ET-Analytics', 'StaticIP Mobility', 'WLAN Switching Policy',
+                 'Central Association', 'Central DHCP', 'Override DNS', 'Flex NAT PAT',
+                 'Umbrella information', 'mDNS Service Policy', 'WLAN Flex Policy',
+                 'Air Time Fairness Profiles', 'Exclusionlist Params', 'WGB Policy',
+                 'Hotspot 2.0', 'Fabric Profile', 'Smart Monitor Profile')
+
+
+def ip(network, index):
+    """Endereço ``index`` dentro de 10.<network>.0.0/16."""
+    return f'10.{network}.{index >> 8 & 255}.{index & 255}'
+
+
+def _header(write):
+    write('\n' + SEPARATOR.format('show clock') + '\n*10:00:00.000 UTC Mon Oct 5 2026\n\n')
+    write(SEPARATOR.format('show version') + '\n')
+    write('Cisco IOS XE Software, Version 17.09.04a\n')
+    write('Cisco IOS Software [Cupertino], C9800 Software (X86_64_LINUX_IOSD-UNIVERSALK9_WLC-M)\n')
+    write('cisco C9800-40-K9 (X86) processor with 12345678K/6147K bytes of memory.\n\n')
+
+
+def _interfaces(write, vlans):
+    write(SEPARATOR.format('show ip interface brief') + '\n')
+    write('Interface              IP-Address      OK? Method Status                Protocol\n')
+    write('GigabitEthernet1       unassigned      YES unset  up                    up\n')
+    write('GigabitEthernet2       unassigned      YES unset  up                    up\n')
+    for index in range(vlans):
+        write(f'Vlan{10 + index:<19}{ip(index, 5):<16}YES NVRAM  up                    up\n')
+    write('\n')
+
+
+def _running_config(write, counts, rng):
+    write(SEPARATOR.format('show running-config') + '\n')
+    write('Building configuration...\n\nCurrent configuration : 123456 bytes\n!\n')
+    write('version 17.9\nservice timestamps debug datetime msec\n!\nhostname WLC-SYNTHETIC-01\n!\n')
+
+    radius_servers = counts['radius_servers']
+    for index in range(radius_servers):
+        write(f'radius server RAD_{index:02d}\n')
+        write(f' address ipv4 {ip(50, 10 + index)} auth-port 1812 acct-port 1813\n')
+        write(f' key 7 {rng.getrandbits(64):016X}\n!\n')
+    for index in range(counts['radius_groups']):
+        write(f'aaa group server radius RAD_GRP_{index:02d}\n')
+        for server in range(min(radius_servers, 2 + index % 3)):
+            write(f' server name RAD_{(index + server) % radius_servers:02d}\n')
+        write(' ip radius source-interface Vlan10\n deadtime 5\n!\n')
+    write('tacacs-server server TACACS_01\ntacacs-server group TACACS_GRP\n!\n')
+    write('aaa authentication login default local\n')
+    for index in range(counts['radius_groups']):
+        write(f'phase 1 name AUTH_{index:02d} type dot1x group RAD_GRP_{index:02d}\n')
+    write('!\nip name-server 10.0.0.53 10.0.1.53\nip domain name synthetic.example\n!\n')
+    write('snmp-server community SNMP_RO RO\nsnmp-server community SNMP_RW RW\n')
+    write(f'snmp-server host {ip(60, 10)} version 2c SNMP_RO\n')
+    write(f'logging host {ip(60, 20)}\nntp ip {ip(60, 30)}\nntp ip {ip(60, 31)}\n!\n')
+
+    for band, _, short in RF_BANDS:
+        for index in range(counts['rf_tags']):
+            write(f'ap dot11 {band} rf-profile RFP_{short}_{index:03d}\n')
+            write(f' description RF profile {short} {index}\n')
+            if index % 2:
+                write(' channel chan-width best\n')
+            else:
+                write(' channel chan-width minimum 20\n channel chan-width maximum 40\n')
+            write(' high-density rx-sop threshold low\n')
+            write(' rate RATE_12M mandatory\n rate RATE_24M supported\n rate RATE_54M supported\n')
+            write(f' tx-power max {rng.randint(14, 30)}\n tx-power min {rng.randint(1, 10)}\n no shutdown\n')
+        write('!\n')
+
+    for index in range(counts['wlans']):
+        write(f'wlan WLAN_{index:03d} {index + 1} SSID_{index:03d}\n')
+        write(' radio policy dot11 24ghz\n radio policy dot11 5ghz\n')
+        kind = index % 3
+        if kind == 0:
+            write(' no security wpa akm dot1x\n security wpa akm psk\n')
+            write(f' security wpa psk set-key ascii 0 {rng.getrandbits(48):012x}\n')
+        elif kind == 1:
+            group = index % counts['radius_groups']
+            write(f' security dot1x authentication-list AUTH_{group:02d}\n')
+            write(f' security dot1x authorization-list AUTHZ_{group:02d}\n')
+        else:
+            write(f' security wpa akm sae\n security sae set-key ascii 0 {rng.getrandbits(48):012x}\n')
+        write(' no shutdown\n')
+    write('!\nend\n\n')
+
+
+def _access_lists(write, counts, rng):
+    write(SEPARATOR.format('show ip access-lists') + '\n')
+    for index in range(counts['acls']):
+        write(f'Extended IP access list ACL_{index:03d}\n')
+        for rule in range(rng.randint(2, 8)):
+            write(f'    {(rule + 1) * 10} permit ip any host {ip(70 + index % 100, rule)}\n')
+    write('\n')
+
+
+def _tags(write, counts):
+    wlans = counts['wlans']
+    write(SEPARATOR.format('show wireless tag policy detailed') + '\n')
+    for index in range(counts['policy_tags']):
+        maps = min(wlans, 1 + index % 4)
+        write(f'Policy Tag Name : PT_{index:03d}\nDescription     : Policy tag {index}\n\n')
+        write(f'Number of WLAN-POLICY maps: {maps}\n')
+        write('WLAN Profile Name                 Policy Name\n' + '-' * 72 + '\n')
+        for offset in range(maps):
+            write(f'{"WLAN_%03d" % ((index + offset) % wlans):<34}PP_{index:03d}\n')
+        write('\n')
+
+    write(SEPARATOR.format('show wireless tag rf detailed') + '\n')
+    for index in range(counts['rf_tags']):
+        write(f'Tag Name                  : RFT_{index:03d}\nDescription               : RF tag {index}\n')
+        write('-' * 40 + '\n')
+        write(f'6ghz RF Policy            : RFP_6_{index:03d}\n5ghz RF Policy            : RFP_5_{index:03d}\n')
+        write(f'2.4ghz RF Policy          : RFP_24_{index:03d}\n\n')
+
+    write(SEPARATOR.format('show wireless tag site all') + '\n')
+    write(f'Number of Site Tags: {counts["site_tags"]}\n\n')
+    for index in range(counts['site_tags']):
+        # Sites locais ficam com o flex profile padrão
+        local = index % 3 == 0 or not counts['flex_profiles']
+        flex = 'default-flex-profile' if local else f'FP_{index % counts["flex_profiles"]:03d}'
+        write(f'Site Tag Name        : ST_{index:03d}\nDescription          : Site {index}\n')
+        write('-' * 40 + '\n')
+        write('AP Profile           : default-ap-profile\n')
+        write(f'Local-site           : {"Yes" if local else "No"}\nImage Download Profile: default\n')
+        write(f'Flex Profile         : {flex}\nFabric Control Plane Name:\n\n')
+
+
+def _profiles(write, counts):
+    acls = counts['acls']
+    write(SEPARATOR.format('show wireless profile flex all') + '\n')
+    for index in range(counts['flex_profiles']):
+        write(f'Flex Profile Name           : FP_{index:03d}\nDescription                 : Flex {index}\n')
+        write(f'Native vlan ID              : {10 + index % 4000}\n')
+        write('Policy ACL                  :\n')
+        write('  ACL Name                          Central Web Auth   URL Filter\n  ' + '-' * 60 + '\n')
+        if acls:
+            write(f'  {"ACL_%03d" % (index % acls):<34}DISABLED          Not Configured\n')
+        write('\nVLAN Name - VLAN ID mapping :\n  VLAN Name                   VLAN ID\n  ' + '-' * 36 + '\n')
+        write(f'  CORP                        {100 + index % 1000}\n  GUEST                       {2000 + index % 1000}\n\n')
+        write('HTTP-Proxy IP Address       : 0.0.0.0\n\n')
+
+    write(SEPARATOR.format('show wireless profile policy detailed') + '\n')
+    for index in range(counts['policy_tags']):
+        write(f'Policy Profile Name                 : PP_{index:03d}\nDescription                         : Policy {index}\n')
+        write('Status                              : ENABLED\n')
+        for setting in POLICY_FILLER:
+            write(f'{setting:<36}: DISABLED\n')
+        write(f'VLAN                                : {100 + index % 1000}\nMulticast VLAN                      : 0\n')
+        write('Idle Timeout                        : 300\nSession Timeout                     : 1800\n')
+        write('QOS per SSID\n  Ingress Service Name              : platinum-up\n')
+        write('  Egress Service Name               : platinum\n')
+        write('QOS per Client\n  Ingress Service Name              : Not Configured\n')
+        write('  Egress Service Name               : Not Configured\n')
+        write(f'AAA Override                        : {"ENABLED" if index % 2 else "DISABLED"}\n')
+        write('NAC                                 : DISABLED\n')
+        write('Accounting List                     : Not Configured\nFlex Central Switching              : ENABLED\n')
+        write('RADIUS Profiling                    : ENABLED\n\n')
+
+
+def _access_points(write, counts, rng):
+    aps = counts['aps']
+    write(SEPARATOR.format('show ap tag summary') + '\n')
+    write(f'Number of APs: {aps}\n\n')
+    write('AP Name                           AP Mac           Site Tag Name                     '
+          'Policy Tag Name                   RF Tag Name                       Misconfigured    Tag Source\n')
+    write('-' * 170 + '\n')
+    for index in range(aps):
+        write(f'{"AP%05d" % index:<34}{"aaaa.%04x.%04x" % (index >> 16, index & 0xffff):<17}'
+              f'{"ST_%03d" % (index % counts["site_tags"]):<34}{"PT_%03d" % (index % counts["policy_tags"]):<34}'
+              f'{"RFT_%03d" % (index % counts["rf_tags"]):<34}No               Static\n')
+    write('\n')
+
+    write(SEPARATOR.format('show ap config general') + '\n')
+    for index in range(aps):
+        write(f'Cisco AP Name   : AP{index:05d}\n' + '=' * 49 + '\n\n')
+        write(f'Cisco AP Identifier                             : aaaa.{index >> 16:04x}.{index & 0xffff:04x}\n')
+        write('Country Code                                    : BR\n')
+        write('IP Address Configuration                        : DHCP\n')
+        write(f'IP Address                                      : {ip(100 + (index >> 16), index & 0xffff)}\n')
+        write('IP Netmask                                      : 255.255.0.0\n')
+        write(f'Gateway IP Address                              : {ip(100 + (index >> 16), 1)}\n')
+        write(f'Software Version                                : {rng.choice(AP_VERSIONS)}\n')
+        write(f'AP Mode                                         : {rng.choice(AP_MODES)}\n')
+        write(f'AP Model                                        : {rng.choice(AP_MODELS)}\n')
+        write('AP User Name                                    : admin\n\n')
+
+
+def default_counts(aps):
+    """Quantidades proporcionais a ``aps``, no formato aceito por generate()."""
+    tags = max(2, min(500, aps // 25))
+    return {
+        'aps': aps,
+        'wlans': max(4, min(64, aps // 100)),
+        'policy_tags': tags,
+        'rf_tags': max(2, tags // 4),
+        'site_tags': tags,
+        'flex_profiles': max(1, tags // 2),
+        'acls': max(4, min(200, aps // 50)),
+        'radius_groups': max(2, min(20, aps // 500)),
+        'radius_servers': 4,
+    }
+
+
+def generate(aps=100, seed=1, **counts):
+    """Texto de um show tech com ``aps`` APs; as demais quantidades vêm de
+    default_counts(aps), sobrescritas pelo que for passado em ``counts``."""
+    unknown = set(counts) - set(default_counts(aps))
+    if unknown:
+        raise TypeError(f'quantidades desconhecidas: {", ".join(sorted(unknown))}')
+    counts = {**default_counts(aps), **counts}
+    rng = random.Random(seed)
+    parts = []
+    write = parts.append
+    _header(write)
+    _interfaces(write, 3)
+    _running_config(write, counts, rng)
+    _access_lists(write, counts, rng)
+    _tags(write, counts)
+    _profiles(write, counts)
+    _access_points(write, counts, rng)
+    write(SEPARATOR.format('show logging') + '\nSyslog logging: enabled\n\n')
+    return ''.join(parts)
+
+
+def write_show_tech(path, aps=100, seed=1, newline='\n', **counts):
+    """Grava generate(aps, seed, **counts) em ``path``, com quebras de linha ``newline``
+    ('\\r\\n' reproduz uma captura de terminal salva no Windows)."""
+    with open(path, 'w', encoding='utf-8', newline=newline) as output:
+        output.write(generate(aps, seed, **counts))
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('output', help='arquivo .txt gerado')
+    parser.add_argument('--aps', type=int, default=100, help='quantidade de APs (padrão: 100)')
+    parser.add_argument('--seed', type=int, default=1, help='semente dos valores aleatórios (padrão: 1)')
+    parser.add_argument('--crlf', action='store_true', help='grava com quebras de linha CRLF (Windows)')
+    for name in ('wlans', 'policy_tags', 'rf_tags', 'site_tags', 'flex_profiles', 'acls',
+                 'radius_groups', 'radius_servers'):
+        parser.add_argument(f'--{name.replace("_", "-")}', type=int, dest=name,
+                            help='padrão: proporcional a --aps')
+    args = parser.parse_args(argv)
+    counts = {name: value for name, value in vars(args).items()
+              if name not in ('output', 'aps', 'seed', 'crlf') and value is not None}
+    write_show_tech(args.output, args.aps, args.seed, '\r\n' if args.crlf else '\n', **counts)
+
+
+if __name__ == '__main__':
+    main()
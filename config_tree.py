@@ -0,0 +1,74 @@
+"""Árvore do running-config por indentação, com índice pelo comando.
+
+No running-config do IOS XE cada comando de primeiro nível começa na coluna
+zero e os seus subcomandos vêm logo abaixo, indentados:
+
+    wlan CORP 1 CORP
+     security dot1x authentication-list ISE
+     no shutdown
+
+O ConfigTree divide o running-config nesses blocos numa única passada e os
+indexa pela primeira palavra do comando ('wlan', 'aaa', 'ap', 'ip'...). Os
+extratores consultam só os blocos do comando que procuram, em vez de varrer
+o texto todo com uma regex multilinha cada um. Os blocos são intervalos
+(início, fim) do buffer original, sem cópia do texto.
+"""
+import re
+
+# Início de cada linha de primeiro nível: quebra de linha seguida de um
+# caractere que não é espaço. O '\n' literal no início deixa a busca rápida
+# mesmo em running-configs grandes.
+TOP_LEVEL_LINE = re.compile(rb'\n(\S+)')
+FIRST_WORD = re.compile(rb'\S+')
+
+
+class ConfigTree:
+    """Blocos de primeiro nível de um running-config (bytes), indexados pela primeira palavra."""
+
+    __slots__ = ('data', '_index')
+
+    def __init__(self, data, spans):
+        """
+        :param data: Buffer com o show tech (bytes ou mmap)
+        :param spans: Intervalos (início, fim) de ``data`` com o running-config
+        """
+        self.data = data
+        self._index = {}
+        for start, end in spans:
+            self._index_span(start, end)
+
+    def _index_span(self, start, end):
+        data = self.data
+        starts = []
+        # A primeira linha do intervalo não tem '\n' antes dela
+        first = FIRST_WORD.match(data, start, end)
+        if first and first.start() == start:
+            starts.append((start, first.group()))
+        for match in TOP_LEVEL_LINE.finditer(data, start, end):
+            starts.append((match.start(1), match.group(1)))
+
+        index = self._index
+        # Cada bloco vai do seu comando até o próximo comando de primeiro nível
+        for i, (block_start, word) in enumerate(starts):
+            block_end = starts[i + 1][0] if i + 1 < len(starts) else end
+            index.setdefault(word, []).append((block_start, block_end))
+
+    def blocks(self, prefix):
+        """
+        Blocos (início, fim) cujo comando começa pelas palavras de ``prefix``
+        (ex.: b'aaa group server radius'), na ordem do running-config. O bloco
+        inclui a linha do comando e as linhas indentadas abaixo dela.
+        """
+        words = prefix.split()
+        candidates = self._index.get(words[0], ())
+        if len(words) == 1:
+            return list(candidates)
+        data = self.data
+        found = []
+        for start, end in candidates:
+            line_end = data.find(b'\n', start, end)
+            if line_end == -1:
+                line_end = end
+            if data[start:line_end].split(None, len(words))[:len(words)] == words:
+                found.append((start, end))
+        return found
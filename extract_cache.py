@@ -0,0 +1,114 @@
+"""Cache em disco dos dados extraídos de arquivos show tech.
+
+Cada entrada guarda o contexto completo de um documento e é identificada pelo
+hash SHA-256 do arquivo de entrada somado a uma string de versão do parser.
+O diretório tem um tamanho máximo: ao passar dele, as entradas usadas há mais
+tempo são apagadas.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+
+# Diretório padrão do cache, sobrescrito pela variável de ambiente LLD_CACHE_DIR
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser('~'), '.cache', 'lld_generator')
+# Tamanho máximo padrão do diretório do cache
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+ENTRY_SUFFIX = '.pickle'
+HASH_CHUNK = 1024 * 1024
+
+
+def file_digest(path):
+    """SHA-256 do conteúdo de ``path``, lido em blocos."""
+    digest = hashlib.sha256()
+    buffer = bytearray(HASH_CHUNK)
+    view = memoryview(buffer)
+    with open(path, 'rb') as input_file:
+        while True:
+            size = input_file.readinto(buffer)
+            if not size:
+                break
+            digest.update(view[:size])
+    return digest.hexdigest()
+
+
+class ContextCache:
+    """Cache de contextos extraídos, com despejo por tamanho (LRU pelo mtime)."""
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or os.environ.get('LLD_CACHE_DIR') or DEFAULT_DIRECTORY
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key_for(self, path, version):
+        """Chave da entrada para o arquivo ``path`` extraído pela versão ``version``."""
+        return hashlib.sha256(f'{file_digest(path)}:{version}'.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def get(self, key):
+        """Retorna o valor guardado em ``key`` ou None se não houver entrada válida."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as entry:
+                value = pickle.load(entry)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, pickle.UnpicklingError):
+            # Entrada corrompida (ex.: disco cheio durante a gravação)
+            self._remove(path)
+            return None
+        # O mtime marca o último uso, usado pelo despejo
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key, value):
+        """Grava ``value`` em ``key`` de forma atômica e aplica o limite de tamanho."""
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as entry:
+                pickle.dump(value, entry, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Apaga as entradas menos usadas até o diretório caber em ``max_bytes``."""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as scan:
+            for item in scan:
+                if not item.name.endswith(ENTRY_SUFFIX):
+                    continue
+                try:
+                    stat = item.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, item.path))
+                total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        with os.scandir(self.directory) as scan:
+            for item in scan:
+                if item.name.endswith(ENTRY_SUFFIX):
+                    self._remove(item.path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -1,7 +1,84 @@
+import importlib
+import os
+import queue
+import threading
+import traceback
+from collections import deque
+
 import customtkinter
-import script
 from tkinter import filedialog
 
+# Intervalo (ms) em que a interface lê as mensagens do worker
+POLL_INTERVAL = 100
+
+# Módulos de cada tipo de equipamento. Nenhum é importado na abertura da
+# janela: o do tipo escolhido começa a ser carregado em segundo plano na
+# seleção, e a geração o importa de qualquer forma ao começar.
+BACKENDS = {
+    "WLC9800": ("script",),
+    "Switch Catalyst": ("script",),
+    "Meraki": ("script", "Meraki"),
+}
+
+
+def preload(modules):
+    """ Importa ``modules`` numa thread, enquanto o usuário preenche os campos """
+    def load():
+        for module in modules:
+            try:
+                importlib.import_module(module)
+            except Exception:
+                # O erro aparece de novo (e é mostrado) quando a geração importar o módulo
+                return
+    threading.Thread(target=load, daemon=True).start()
+
+
+class GenerationCancelled(Exception):
+    """Levantada no worker, pelo callback de progresso, quando o usuário cancela."""
+
+
+class GenerationWorker(threading.Thread):
+    """
+    Gera um documento fora da thread do Tk. O progresso e o resultado vão para
+    ``messages`` e são lidos pela interface com after(); a geração é
+    interrompida entre duas etapas quando ``cancel()`` é chamado.
+    """
+
+    def __init__(self, show_tech_path, template_path):
+        super().__init__(daemon=True)
+        self.show_tech_path = show_tech_path
+        self.template_path = template_path
+        # Um documento por show tech, para que gerações na fila não se sobrescrevam
+        stem = os.path.splitext(os.path.basename(show_tech_path))[0]
+        self.output_path = f'{stem}_AsBuilt_LLD.docx'
+        self.messages = queue.Queue()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def progress(self, stage, done, total):
+        # O cancelamento vale no próximo relatório: depois de cada extrator, do
+        # load_template e do render (logo, antes do save). O último relatório
+        # vem com o documento já gravado e não é mais interrompido.
+        if self._cancelled.is_set() and done < total:
+            raise GenerationCancelled()
+        self.messages.put(('progress', stage, done, total))
+
+    def run(self):
+        try:
+            # O parser e o docxtpl só são carregados quando a geração começa
+            import script
+            script.cisco_built_generator(self.show_tech_path, self.template_path,
+                                         output_path=self.output_path,
+                                         progress=self.progress)
+        except GenerationCancelled:
+            self.messages.put(('cancelled',))
+        except Exception:
+            self.messages.put(('error', traceback.format_exc(limit=1).strip().splitlines()[-1]))
+        else:
+            self.messages.put(('done', self.output_path))
+
 
 class App(customtkinter.CTk):
     def __init__(self):
@@ -42,7 +119,21 @@ class App(customtkinter.CTk):
 
         # --- Botão Gerar ---
         self.generate_button = customtkinter.CTkButton(self.main_frame, text="Gerar", command=self.doc_generator)
-        self.generate_button.grid(row=5, column=0, padx=20, pady=20, sticky="ew")
+        self.generate_button.grid(row=5, column=0, padx=20, pady=(20, 5), sticky="ew")
+
+        # --- Progresso da geração ---
+        self.progress_bar = customtkinter.CTkProgressBar(self.main_frame)
+        self.progress_bar.grid(row=6, column=0, padx=20, pady=5, sticky="ew")
+        self.progress_bar.set(0)
+        self.status_label = customtkinter.CTkLabel(self.main_frame, text="", anchor="w")
+        self.status_label.grid(row=7, column=0, padx=20, pady=0, sticky="ew")
+        self.cancel_button = customtkinter.CTkButton(self.main_frame, text="Cancelar", state="disabled",
+                                                     command=self.cancel_generation)
+        self.cancel_button.grid(row=8, column=0, padx=20, pady=(5, 20), sticky="ew")
+
+        # Gerações pedidas enquanto outra está em andamento esperam na fila
+        self.pending_jobs = deque()
+        self.worker = None
 
     def setup_cisco_ui(self):
         """ Configura os campos para WLC9800 e Switch Catalyst """
@@ -114,6 +205,8 @@ class App(customtkinter.CTk):
         self.cisco_options_frame.grid_forget()
         self.meraki_options_frame.grid_forget()
 
+        preload(BACKENDS.get(choice, ()))
+
         # Mostra o frame correto
         if choice in ["WLC9800", "Switch Catalyst"]:
             self.cisco_options_frame.grid(row=3, column=0, padx=20, pady=10, sticky="ew")
@@ -136,7 +229,7 @@ class App(customtkinter.CTk):
             print(f"  - Arquivo Show Tech: {self.show_tech_entry.get()}")
             print(f"  - Arquivo AP Summary: {self.ap_summary_entry.get()} Ainda não implementado na geração de documentos")
             print(f"  - Arquivo de Template: {self.cisco_template_entry.get()}")
-            script.cisco_built_generator(f'{self.show_tech_entry.get()}', f'{self.cisco_template_entry.get()}')
+            self.queue_generation(f'{self.show_tech_entry.get()}', f'{self.cisco_template_entry.get()}')
 
         elif get_type == "Meraki":
             print(f"  - Token da API: {self.token_entry.get()}")
@@ -150,6 +243,61 @@ class App(customtkinter.CTk):
 
         print("=" * 30)
 
+    def queue_generation(self, show_tech_path, template_path):
+        """ Põe a geração na fila e a inicia se nenhuma estiver em andamento """
+        self.pending_jobs.append((show_tech_path, template_path))
+        if self.worker is None:
+            self.start_next_job()
+        else:
+            self.status_label.configure(text=f"{len(self.pending_jobs)} geração(ões) na fila")
+
+    def start_next_job(self):
+        if not self.pending_jobs:
+            self.worker = None
+            self.cancel_button.configure(state="disabled")
+            return
+        self.worker = GenerationWorker(*self.pending_jobs.popleft())
+        self.progress_bar.set(0)
+        self.status_label.configure(text=f"Gerando {self.worker.output_path}...")
+        self.cancel_button.configure(state="normal")
+        self.worker.start()
+        self.after(POLL_INTERVAL, self.poll_worker)
+
+    def poll_worker(self):
+        """ Lê as mensagens do worker sem bloquear a interface """
+        worker = self.worker
+        while True:
+            try:
+                message = worker.messages.get_nowait()
+            except queue.Empty:
+                break
+            kind = message[0]
+            if kind == 'progress':
+                _, stage, done, total = message
+                self.progress_bar.set(done / total)
+                self.status_label.configure(text=f"{stage} ({done}/{total})")
+                continue
+            if kind == 'done':
+                self.progress_bar.set(1)
+                self.status_label.configure(text=f"Documento gerado: {message[1]}")
+            elif kind == 'cancelled':
+                self.progress_bar.set(0)
+                self.status_label.configure(text="Geração cancelada")
+            else:
+                self.status_label.configure(text=f"Falha na geração: {message[1]}")
+            print(self.status_label.cget("text"))
+            self.start_next_job()
+            return
+        self.after(POLL_INTERVAL, self.poll_worker)
+
+    def cancel_generation(self):
+        """ Cancela a geração em andamento e as que estão na fila """
+        self.pending_jobs.clear()
+        if self.worker is not None:
+            self.worker.cancel()
+            self.cancel_button.configure(state="disabled")
+            self.status_label.configure(text="Cancelando...")
+
 
 if __name__ == "__main__":
     app = App()
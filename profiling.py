@@ -0,0 +1,106 @@
+"""Medição de tempo e memória das etapas da geração de um documento.
+
+Ligada com profile=True em cisco_built_generator, com --profile no batch ou
+com a variável de ambiente LLD_PROFILE=1. Cada etapa (carga do arquivo, cada
+extrator get_*, carga do template, render e save) registra o tempo de
+relógio, o tempo de CPU e o pico de memória alocada (tracemalloc) durante a
+etapa. O relatório é gravado em JSON ao lado do documento gerado.
+"""
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Variável de ambiente que liga a medição quando profile não é informado
+ENV_VAR = 'LLD_PROFILE'
+REPORT_SUFFIX = '.profile.json'
+
+
+def enabled(profile=None):
+    """``profile`` se informado; senão, se LLD_PROFILE está ligada."""
+    if profile is not None:
+        return bool(profile)
+    return os.environ.get(ENV_VAR, '').strip().lower() not in ('', '0', 'false', 'no')
+
+
+def report_path(output_path):
+    """Caminho do relatório de ``output_path`` (documento.docx -> documento.profile.json)."""
+    return os.path.splitext(output_path)[0] + REPORT_SUFFIX
+
+
+@contextmanager
+def measuring(stage, records):
+    """Mede o bloco ``with`` e acrescenta o registro da etapa ``stage`` a ``records``."""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    start_memory = tracemalloc.get_traced_memory()[0]
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    yield
+    records.append({
+        'stage': stage,
+        'wall_seconds': time.perf_counter() - start_wall,
+        'cpu_seconds': time.process_time() - start_cpu,
+        # Pico acima do que já estava alocado no início da etapa
+        'peak_bytes': tracemalloc.get_traced_memory()[1] - start_memory,
+        'pid': os.getpid(),
+    })
+
+
+def measure(stage, function, *args):
+    """Executa function(*args) e devolve (resultado, registro da etapa ``stage``).
+
+    Usada também nos processos de extração, que devolvem o registro junto
+    com o resultado.
+    """
+    records = []
+    with measuring(stage, records):
+        result = function(*args)
+    return result, records[0]
+
+
+class Profiler:
+    """Registros das etapas de uma geração."""
+
+    def __init__(self):
+        self.records = []
+        self._started = time.perf_counter()
+        # Só para o tracemalloc em close() se foi este Profiler que o iniciou
+        self._stop_tracing = not tracemalloc.is_tracing()
+        if self._stop_tracing:
+            tracemalloc.start()
+
+    def add(self, record):
+        self.records.append(record)
+
+    @contextmanager
+    def stage(self, stage):
+        """Mede o bloco ``with`` como a etapa ``stage``."""
+        with measuring(stage, self.records):
+            yield
+
+    def report(self, **info):
+        return {
+            **info,
+            'total_wall_seconds': time.perf_counter() - self._started,
+            'peak_bytes': max((record['peak_bytes'] for record in self.records), default=0),
+            'stages': self.records,
+        }
+
+    def save(self, path, **info):
+        """Grava o relatório em ``path``."""
+        with open(path, 'w', encoding='utf-8') as report_file:
+            json.dump(self.report(**info), report_file, indent=2)
+        return path
+
+    def close(self):
+        """
+        Para o tracemalloc se foi este Profiler que o iniciou. Deve ser chamado
+        também quando a geração falha ou é cancelada; senão o rastreamento
+        continua ligado e deixa lentas as próximas gerações do processo.
+        """
+        if self._stop_tracing:
+            tracemalloc.stop()
+            self._stop_tracing = False
@@ -0,0 +1,97 @@
+"""Junção AP -> tags -> profiles para os templates.
+
+Os extratores do ShowTechWireless devolvem listas independentes (tags, RF
+profiles, flex profiles, WLANs, policy profiles). O TagResolver indexa cada
+uma pelo nome uma única vez e monta, para cada AP do "show ap tag summary",
+um registro com os objetos já resolvidos, evitando laços aninhados no
+template.
+"""
+
+# Campo da RF tag com o nome do RF profile de cada banda
+RF_TAG_BANDS = (
+    ('6ghz', 'wifi_ax'),
+    ('5ghz', 'wifi_ac'),
+    ('24ghz', 'wifi_n'),
+)
+
+
+def index_by(records, key):
+    # Em nomes repetidos vale o primeiro, como numa busca linear
+    index = {}
+    for record in records:
+        index.setdefault(record[key], record)
+    return index
+
+
+class TagResolver:
+    def __init__(self, policy_tags=(), site_tags=(), rf_tags=(), rf_profiles=(),
+                 flex_profiles=(), wlans=(), policy_profiles=()):
+        self.policy_tags = index_by(policy_tags, 'name')
+        self.site_tags = index_by(site_tags, 'name')
+        self.rf_tags = index_by(rf_tags, 'name')
+        self.flex_profiles = index_by(flex_profiles, 'name')
+        self.wlans = index_by(wlans, 'profile_name')
+        self.policy_profiles = index_by(policy_profiles, 'name')
+        self.rf_profiles = {}
+        for profile in rf_profiles:
+            self.rf_profiles.setdefault((profile['frequency_band'], profile['name']), profile)
+
+        # APs com as mesmas tags compartilham os objetos resolvidos
+        self._site_cache = {}
+        self._policy_cache = {}
+        self._rf_cache = {}
+
+    def site(self, tag_name):
+        """(site tag, flex profile) da site tag ``tag_name``."""
+        if tag_name not in self._site_cache:
+            site_tag = self.site_tags.get(tag_name)
+            flex_profile = self.flex_profiles.get(site_tag['flex_profile']) if site_tag else None
+            self._site_cache[tag_name] = (site_tag, flex_profile)
+        return self._site_cache[tag_name]
+
+    def policy(self, tag_name):
+        """(policy tag, [{'wlan', 'policy'}]) da policy tag ``tag_name``."""
+        if tag_name not in self._policy_cache:
+            policy_tag = self.policy_tags.get(tag_name)
+            wlans = []
+            if policy_tag:
+                # wlan_policy_maps vem do extrator como "WLAN: POLICY" por linha
+                for line in policy_tag['wlan_policy_maps'].splitlines():
+                    wlan_name, _, policy_name = line.partition(': ')
+                    wlans.append({
+                        'wlan_name': wlan_name,
+                        'policy_name': policy_name,
+                        'wlan': self.wlans.get(wlan_name),
+                        'policy': self.policy_profiles.get(policy_name),
+                    })
+            self._policy_cache[tag_name] = (policy_tag, wlans)
+        return self._policy_cache[tag_name]
+
+    def rf(self, tag_name):
+        """(RF tag, {banda: RF profile}) da RF tag ``tag_name``."""
+        if tag_name not in self._rf_cache:
+            rf_tag = self.rf_tags.get(tag_name)
+            profiles = {}
+            if rf_tag:
+                for band, field in RF_TAG_BANDS:
+                    profiles[band] = self.rf_profiles.get((band, rf_tag[field]))
+            self._rf_cache[tag_name] = (rf_tag, profiles)
+        return self._rf_cache[tag_name]
+
+    def resolve(self, ap_tag):
+        """Registro de um AP (item de get_ap_tag) com tags e profiles resolvidos."""
+        site_tag, flex_profile = self.site(ap_tag['site_tag_name'])
+        policy_tag, wlans = self.policy(ap_tag['policy_tag_name'])
+        rf_tag, rf_profiles = self.rf(ap_tag['rf_tag_name'])
+        return {
+            **ap_tag,
+            'site_tag': site_tag,
+            'flex_profile': flex_profile,
+            'policy_tag': policy_tag,
+            'wlans': wlans,
+            'rf_tag': rf_tag,
+            'rf_profiles': rf_profiles,
+        }
+
+    def resolve_all(self, ap_tags):
+        return [self.resolve(ap_tag) for ap_tag in ap_tags]
@@ -1,24 +1,79 @@
-from show_tech import ShowTechWireless
-from Meraki import GetMerakiConfig
-from docxtpl import DocxTemplate
-
-
-
-def cisco_built_generator(show_tech_entry, cisco_template_entry):
-    # Carregar dados do arquivo "show tech wireless"
-    with open(f'{show_tech_entry}', 'r') as file:
-        show_tech_data = file.read()
-
-    # Criar a instância da classe
-    show_tech = ShowTechWireless(show_tech_data)
+import os
+import tempfile
+from contextlib import nullcontext
+
+import profiling
+from show_tech import PARSER_VERSION, extract
+from resolver import TagResolver
+from templates import load_template
+
+
+
+# Extratores usados no documento Cisco. Os mais pesados (seções por AP e por
+# profile) vêm primeiro para que o pool os distribua antes dos mais leves.
+CISCO_EXTRACTORS = (
+    'get_ap_inventory',
+    'get_ap_tag',
+    'get_policy_profile',
+    'get_acl',
+    'get_rf_profile_details',
+    'get_wlan',
+    'get_site_tag',
+    'get_flex_profile',
+    'get_policy_tag',
+    'get_rf_tag',
+    'get_hostname',
+    'get_wlc_ip',
+    'get_version',
+    'get_ntp',
+    'get_snmp',
+    'get_snmp_trap',
+    'get_loggin',
+    'get_radius_server',
+    'get_radius_group',
+)
+
+
+# Versão do formato do contexto montado por cisco_context (chaves, campos do
+# resolver.TagResolver). Deve ser incrementada sempre que o contexto mudar de
+# forma, para que os contextos guardados em cache sejam montados de novo.
+CONTEXT_VERSION = '1'
+
+
+# Etapas do documento depois da extração, na ordem em que são reportadas
+RENDER_STAGES = ('load_template', 'render', 'save')
+
+
+def save_document(doc_template, output_path):
+    # Salva num arquivo temporário no mesmo diretório e troca pelo destino
+    # com os.replace, para que ninguém leia um .docx gravado pela metade
+    directory = os.path.dirname(os.path.abspath(output_path))
+    fd, tmp_path = tempfile.mkstemp(suffix='.docx.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as tmp_file:
+            doc_template.save(tmp_file)
+        # mkstemp cria o arquivo com 0600; o documento final é legível
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return output_path
+
+
+def cisco_context(show_tech_entry, workers=None, cache=None, progress=None, profiler=None):
+    # Extrair os dados do "show tech wireless"; com workers > 1 os extratores
+    # rodam em paralelo, cada processo mapeando o arquivo em memória, e com
+    # cache só são executados os extratores cujas seções mudaram
+    results = extract(f'{show_tech_entry}', CISCO_EXTRACTORS, workers, cache, progress, profiler)
 
 
     #Variaveis
     #WLC Hostname
-    hostname = show_tech.get_hostname()
+    hostname = results['get_hostname']
 
     #WLC IP
-    wlc_if = show_tech.get_wlc_ip()
+    wlc_if = results['get_wlc_ip']
     wlc_if_dict = {}
     wlc_interfaces = ''
     wlc_ips = ''
@@ -29,53 +84,55 @@ def cisco_built_generator(show_tech_entry, cisco_template_entry):
 
 
     #Version
-    version = show_tech.get_version()
+    version = results['get_version']
 
     #NTPs Servers
-    ntp = show_tech.get_ntp()
+    ntp = results['get_ntp']
 
     #SNMP Communities
-    snmp = show_tech.get_snmp()
+    snmp = results['get_snmp']
 
     #SNMP Trap Servers
-    snmp_trap = show_tech.get_snmp_trap()
+    snmp_trap = results['get_snmp_trap']
 
     #SysLog
-    logging = show_tech.get_loggin()
+    logging = results['get_loggin']
 
     #Radius Servers
-    radius_servers = show_tech.get_radius_server()
+    radius_servers = results['get_radius_server']
 
     #Radius Groups
-    radius_groups = show_tech.get_radius_group()
+    radius_groups = results['get_radius_group']
 
     #AP List
-    ap_list = show_tech.get_ap_inventory()
+    ap_list = results['get_ap_inventory']
 
     #ACL List
-    acl = show_tech.get_acl()
+    acl = results['get_acl']
 
     #WLAN Profile
-    wlan = show_tech.get_wlan()
+    wlan = results['get_wlan']
 
     #Policy Profile
-    policy = show_tech.get_policy_profile()
+    policy = results['get_policy_profile']
 
     #Policy TAG
-    policy_tag = show_tech.get_policy_tag()
+    policy_tag = results['get_policy_tag']
+
+    rf_tag = results['get_rf_tag']
 
-    rf_tag = show_tech.get_rf_tag()
+    rf_profiles = results['get_rf_profile_details']
 
-    rf_profiles = show_tech.get_rf_profile_details()
+    site_tag = results['get_site_tag']
 
-    # Testar todas as funções e imprimir seus resultados
-    # print("WLC IP and Interface:", show_tech.get_wlc_ip())
-    site_tag = show_tech.get_site_tag()
+    flex_profile = results['get_flex_profile']
 
-    flex_profile = show_tech.get_flex_profile()
+    #AP Tags, com site tag, flex profile, policy tag (WLANs) e RF profiles já resolvidos
+    ap_tags = results['get_ap_tag']
+    ap_details = TagResolver(policy_tag, site_tag, rf_tag, rf_profiles,
+                             flex_profile, wlan, policy).resolve_all(ap_tags)
 
-    doc_template = DocxTemplate(f'{cisco_template_entry}')
-    context = {
+    return {
         ## Inventory
         'hostname': hostname,
         'wlc_interfaces': wlc_interfaces,
@@ -103,39 +160,102 @@ def cisco_built_generator(show_tech_entry, cisco_template_entry):
         'rf_tag': rf_tag,
         'rf_profiles': rf_profiles,
         'ap_list': ap_list,
+        'ap_tags': ap_tags,
+        'ap_details': ap_details,
         ## Site
         'site_tag': site_tag,
         'flex_profile': flex_profile
     }
 
-    doc_template.render(context)
-    doc_template.save('AsBuilt_LLD.docx')
-
-def meraki_built_generator(token, organization_name, template_entry, network_name = ''):
-    # Start
-    report = GetMerakiConfig(token, organization_name)
 
-    #List Network IDs
-    report.get_network_list(network_name)
-    # List of all devices from Network IDs
-    device_list = report.get_devices()
-    # List type of networks
-    report.get_product_types()
-    productType = list(set(report.productType))
-
-    # Get Wireless Settings
-    wireless_settings = report.get_wireless_setting()
-    # Get SSIDs
-    ssids = report.get_ssid()
+def cisco_built_generator(show_tech_entry, cisco_template_entry, workers=None,
+                          output_path='AsBuilt_LLD.docx', cache=None, progress=None, profile=None):
+    # Com um ContextCache, um show tech já processado (mesmo conteúdo, mesma
+    # PARSER_VERSION e mesma CONTEXT_VERSION) vai direto para o render, sem passar pelo parser.
+    # progress(etapa, concluídas, total) é chamado a cada extrator e a cada
+    # etapa de RENDER_STAGES; uma exceção levantada nele interrompe a geração.
+    # Com profile (ou LLD_PROFILE=1), grava <documento>.profile.json com o
+    # tempo e a memória de cada etapa
+    total = len(CISCO_EXTRACTORS) + len(RENDER_STAGES)
+    profiler = profiling.Profiler() if profiling.enabled(profile) else None
+
+    def report(stage, done):
+        if progress is not None:
+            progress(stage, done, total)
+
+    def stage(name):
+        return profiler.stage(name) if profiler is not None else nullcontext()
+
+    try:
+        context = None
+        if cache is not None:
+            key = cache.key_for(f'{show_tech_entry}', f'{PARSER_VERSION}:{CONTEXT_VERSION}')
+            context = cache.get(key)
+            if context is not None:
+                report('cache', len(CISCO_EXTRACTORS))
+        context_cached = context is not None
+        if context is None:
+            context = cisco_context(show_tech_entry, workers, cache,
+                                    lambda stage, done, _: report(stage, done), profiler)
+            if cache is not None:
+                cache.put(key, context)
+
+        with stage('load_template'):
+            doc_template = load_template(f'{cisco_template_entry}')
+        report('load_template', len(CISCO_EXTRACTORS) + 1)
+        with stage('render'):
+            doc_template.render(context)
+        report('render', len(CISCO_EXTRACTORS) + 2)
+        with stage('save'):
+            save_document(doc_template, output_path)
+        report('save', total)
+
+        if profiler is not None:
+            profiler.save(profiling.report_path(output_path),
+                          show_tech=os.path.abspath(show_tech_entry),
+                          template=os.path.abspath(cisco_template_entry),
+                          output=os.path.abspath(output_path),
+                          parser_version=PARSER_VERSION,
+                          context_version=CONTEXT_VERSION,
+                          workers=workers,
+                          context_cached=context_cached)
+    finally:
+        # Também em caso de erro ou cancelamento, para não deixar o tracemalloc ligado
+        if profiler is not None:
+            profiler.close()
+    return output_path
+
+def meraki_built_generator(token, organization_name, template_entry, network_name = '', concurrency=None,
+                           snapshot=None, replay=False, multi_org=False):
+    # O SDK da Meraki (e sua pilha HTTP) só é importado quando um documento Meraki é gerado
+    from Meraki import GetMerakiConfig
+
+    # Start (com concurrency, as chamadas por network são feitas em paralelo;
+    # com snapshot, as respostas da API são gravadas nele ou, com replay=True,
+    # lidas dele sem acessar a rede)
+    report = GetMerakiConfig(token, organization_name, concurrency=concurrency,
+                             snapshot=snapshot, replay=replay)
+
+    if multi_org:
+        # Todas as organizações encontradas são coletadas em paralelo; o
+        # template recebe a lista 'organizations' (um contexto por cliente) e,
+        # nas chaves de sempre, os dados de todas juntas
+        organizations = report.collect_organizations(network_name)
+        context = {
+            'organizations': organizations,
+            'productType': sorted({product for org in organizations for product in org['productType']}),
+            'device_list': [device for org in organizations for device in org['device_list']],
+            'wireless_settings': [setting for org in organizations for setting in org['wireless_settings']],
+            'ssids': [ssid for org in organizations for ssid in org['ssids']],
+        }
+    else:
+        context = report.collect(network_name)
+    report.save_snapshot()
+    print(report.cache_report())
+    print(report.rate_report())
 
     ## Generate Document
-    doc_template = DocxTemplate(f'{template_entry}')
-    context = {
-        'productType': productType,
-        'device_list': device_list,
-        'wireless_settings': wireless_settings,
-        'ssids': ssids
-    }
+    doc_template = load_template(f'{template_entry}')
 
     doc_template.render(context)
     doc_template.save('Meraki_AsBuilt_LLD.docx')
@@ -1,45 +1,517 @@
+import hashlib
+import itertools
+import mmap
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+
+from ap_inventory import APInventory
+from config_tree import ConfigTree
+from profiling import measure
+
+# Codificação usada para decodificar os campos capturados do show tech
+ENCODING = 'utf-8'
+
+# Cabeçalho que o show tech coloca antes da saída de cada comando:
+# "------------------ show running-config ------------------"
+SECTION_MARKER = b'------------------ show '
+SECTION_HEADER = re.compile(rb'-+\s+(show\s.*?)\s+-+\s*$')
+
+# Versão da saída dos extratores. Deve ser incrementada sempre que algum
+# get_* passar a devolver algo diferente para o mesmo show tech, para
+# invalidar os resultados guardados em cache.
+PARSER_VERSION = '7'
+
+RUNNING_CONFIG = ('show running-config',)
+
+# Seções do show tech que cada extrator consulta. Um nome casa com todas as
+# seções que começam com ele (ex.: 'show wireless tag policy detailed' cobre
+# 'show wireless tag policy detailed PT_SITE1'). Extratores ausentes daqui
+# continuam varrendo o arquivo inteiro.
+EXTRACTOR_SECTIONS = {
+    'get_hostname': RUNNING_CONFIG,
+    'get_wlc_ip': ('show ip interface brief',),
+    'get_version': ('show version',),
+    'get_policy_tag': ('show wireless tag policy',),
+    'get_rf_tag': ('show wireless tag rf',),
+    'get_rf_profile_details': RUNNING_CONFIG,
+    'get_site_tag': ('show wireless tag site all',),
+    'get_flex_profile': ('show wireless profile flex all',),
+    'get_ap_tag': ('show ap tag summary',),
+    'get_snmp': RUNNING_CONFIG,
+    'get_snmp_trap': RUNNING_CONFIG,
+    'get_loggin': RUNNING_CONFIG,
+    'get_ntp': RUNNING_CONFIG,
+    'get_dns': RUNNING_CONFIG,
+    'get_acl': ('show ip access-lists', 'show access-lists'),
+    'get_radius_server': RUNNING_CONFIG,
+    'get_radius_group': RUNNING_CONFIG,
+    'get_tacacs_server': RUNNING_CONFIG,
+    'get_tacacs_group': RUNNING_CONFIG,
+    'get_method_list': RUNNING_CONFIG,
+    'get_wlan': RUNNING_CONFIG,
+    'get_ap_inventory': ('show ap config general',),
+    'get_policy_profile': ('show wireless profile policy',),
+}
+
+HOSTNAME = re.compile(rb'hostname\s+(\S+)')
+WLC_IP = re.compile(rb'(\S+)\s+(\d+\.\d+\.\d+\.\d+)\s+.*')
+VERSION = re.compile(rb'Cisco\s+IOS\s+XE\s+Software,\s+Version\s+(\S+)')
+POLICY_TAG = re.compile(rb"Policy Tag Name\s*:\s*(\S+)\s*Description\s*:\s*([\w\s]*)\s*Number of WLAN-POLICY maps\s*:\s*(\d+)\s*([\s\S]*?)(?=\n\s*Policy Tag Name|\Z)")
+RF_TAG = re.compile(rb"Tag Name\s*:\s*(\S+)\s*Description\s*:\s*([\w\s]*)\s*-{30,}\s*6ghz RF Policy\s*:\s*(\S+)\s*5ghz RF Policy\s*:\s*(\S+)\s*2.4ghz RF Policy\s*:\s*(\S+)")
+SNMP_COMMUNITY = re.compile(rb'snmp-server\s+community\s+(\S+)\s+(\S+)')
+SNMP_TRAP = re.compile(rb'snmp-server\s+host\s+([0-9]+.[0-9]+.[0-9]+.[0-9]+)')
+LOGGING_HOST = re.compile(rb'logging\s+host\s+([0-9]+.[0-9]+.[0-9]+.[0-9]+)')
+NTP = re.compile(rb'ntp\s+ip\s+(\S+)')
+NAME_SERVER = re.compile(rb'ip\s+name-server\s+(\S+)')
+DOMAIN_NAME = re.compile(rb'ip\s+domain\s+name\s+(\S+)')
+NO_DNS_LOOKUP = re.compile(rb'no\s+dns-lookups')
+RADIUS_SERVER = re.compile(rb'radius\s+server\s+(\S+)\s+address\s+ipv4\s+(\S+)\s+auth-port\s+(\S+)\s+acct-port\s+(\S+)')
+RADIUS_GROUP_HEADER = re.compile(rb"aaa\s+group\s+server\s+radius\s+(\S+)\r?\n")
+RADIUS_GROUP_SERVER = re.compile(rb"^\s+server\s+name\s+(\S+)", re.MULTILINE)
+TACACS_SERVER = re.compile(rb'tacacs-server\s+server\s+(\S+)')
+TACACS_GROUP = re.compile(rb'tacacs-server\s+group\s+(\S+)')
+METHOD_LIST = re.compile(rb'phase\s+(\S+)\s+name\s+(\S+)\s+type\s+(\S+)\s+group\s+(\S+)')
+
+# Linhas globais do running-config lidas por get_hostname, get_snmp, get_ntp,
+# get_dns, get_radius_server etc. Cada padrão é procurado no running-config só
+# quando um extrator o consulta pela primeira vez, e as ocorrências ficam
+# guardadas por ShowTechWireless para as demais consultas (get_dns usa três
+# padrões, e um extrator chamado de novo não varre o texto outra vez). No
+# módulo re uma alternativa única (?P<a>...)|(?P<b>...) perde a busca acelerada
+# pelo prefixo literal de cada padrão e ficou de 5 a 40 vezes mais lenta nos
+# show techs de teste do que as passadas separadas.
+GLOBAL_CONFIG_PATTERNS = {
+    'hostname': HOSTNAME,
+    'snmp_community': SNMP_COMMUNITY,
+    'snmp_trap': SNMP_TRAP,
+    'logging_host': LOGGING_HOST,
+    'ntp': NTP,
+    'name_server': NAME_SERVER,
+    'domain_name': DOMAIN_NAME,
+    'no_dns_lookup': NO_DNS_LOOKUP,
+    'radius_server': RADIUS_SERVER,
+    'tacacs_server': TACACS_SERVER,
+    'tacacs_group': TACACS_GROUP,
+    'method_list': METHOD_LIST,
+}
+WLAN_HEADER = re.compile(rb"wlan\s+(\S+)\s+(\d+)\s+(\S+)\r?\n")
+
+# Campos de cada AP no "show ap config general", na ordem de APInventory.append
+AP_INVENTORY_FIELDS = {
+    b'Cisco AP Name   ': 0,
+    b'Country Code': 1,
+    b'IP Address Configuration': 2,
+    b'IP Address': 3,
+    b'IP Netmask': 4,
+    b'Gateway IP Address': 5,
+    b'AP Mode': 6,
+    b'Software Version': 7,
+    b'AP Model': 8,
+    b'AP User Name': 9,
+}
+# Linha 'Campo ... : valor' de um desses campos. Como no parser por linhas que
+# ela substitui, o valor é o trecho entre o primeiro e o segundo ':' e os
+# prefixos mais longos ('IP Address Configuration', 'AP Model') vêm antes
+AP_INVENTORY_LINE = re.compile(
+    rb'^([ \t\r\v\f]*)(Cisco AP Name   (?=:)|Country Code|IP Address Configuration|IP Address'
+    rb'|IP Netmask|Gateway IP Address|AP Model|AP Mode|Software Version|AP User Name)'
+    rb'[^:\n]*:([^:\n]*)', re.MULTILINE)
+
+# Inícios de bloco usados com ShowTechWireless._blocks
+RF_PROFILE_HEADER = re.compile(rb"ap dot11 (\S+) rf-profile (\S+)")
+SITE_TAG_START = re.compile(rb'(?=Site Tag Name\s*:)')
+FLEX_PROFILE_START = re.compile(rb'(?=Flex Profile Name\s*:)')
+POLICY_PROFILE_START = re.compile(rb'(?=Policy Profile Name\s*:)')
+NON_SPACE = re.compile(rb'\S')
+
+SITE_TAG_NAME = re.compile(rb"Site Tag Name\s*:\s*(.*)")
+SITE_TAG_DESCRIPTION = re.compile(rb"Description\s*:\s*(S*)")
+SITE_TAG_FLEX_PROFILE = re.compile(rb"Flex Profile\s*:\s*(.*)")
+SITE_TAG_AP_PROFILE = re.compile(rb"AP Profile\s*:\s*(.*)")
+SITE_TAG_LOCAL_SITE = re.compile(rb"Local-site\s*:\s*(.*)")
+
+FLEX_PROFILE_NAME = re.compile(rb"Flex Profile Name\s*:\s*(.*)")
+FLEX_NATIVE_VLAN = re.compile(rb"Native vlan ID\s*:\s*(\d+)")
+FLEX_POLICY_ACL = re.compile(rb'Policy ACL\s*:\s*\n(.*?)(?=VLAN Name - VLAN ID mapping|HTTP-Proxy)', re.DOTALL)
+FLEX_VLAN_MAPPING = re.compile(rb'VLAN Name - VLAN ID mapping\s*:\s*\n(.*?)(?=HTTP-Proxy)', re.DOTALL)
+FIRST_WORD = re.compile(rb'^\s*(\S+)', re.MULTILINE)
+VLAN_ID_PAIR = re.compile(rb'^\s*(\S+)\s+(\d+)', re.MULTILINE)
+
+# Campos 'Chave : Valor' de cada Policy Profile, reconhecidos por um único
+# scanner (POLICY_PROFILE_TOKENS). Como nas regexes que eles substituem, a
+# chave pode ser o final do rótulo ('VLAN' também casa com 'Multicast VLAN :')
+# e vale a primeira ocorrência no bloco.
+POLICY_PROFILE_FIELDS = {
+    b'Policy Profile Name': 'name',
+    b'VLAN': 'vlan',
+    b'Idle Timeout': 'idle_timeout',
+    b'Session Timeout': 'session_timeout',
+    b'AAA Override': 'aaa_override',
+    b'NAC': 'nac',
+    b'Accounting List': 'accounting_list',
+}
+
+# Subcampos de QoS: cabeçalho (sozinho na linha) -> ((regex aplicada logo
+# após o cabeçalho, campo), ...)
+POLICY_PROFILE_QOS_FIELDS = {
+    b'QOS per SSID': ((re.compile(rb"\s+Ingress Service Name\s*:\s*(.*)"), 'qos_per_ssid_ingress'),
+                      (re.compile(rb"(?:.*\n)\s+Egress Service Name\s*:\s*(.*)"), 'qos_per_ssid_egress')),
+    b'QOS per Client': ((re.compile(rb"\s+Ingress Service Name\s*:\s*(.*)"), 'qos_per_client_ingress'),
+                        (re.compile(rb"(?:.*\n)\s+Egress Service Name\s*:\s*(.*)"), 'qos_per_client_egress')),
+}
+
+# Scanner das chaves e dos cabeçalhos 'QOS per ...'; o valor é lido logo após a
+# chave. Os cabeçalhos de QoS incluem a quebra de linha (LF ou CRLF).
+POLICY_PROFILE_TOKENS = re.compile(
+    rb"(" + b"|".join(map(re.escape, POLICY_PROFILE_FIELDS)) + rb"|QOS per SSID\r?\n|QOS per Client\r?\n)")
+FIELD_VALUE = re.compile(rb"\s*:\s*(.*)")
+
+# Textos procurados literalmente em cada Policy Profile (as barras fazem
+# parte do texto procurado, exatamente como na versão anterior).
+POLICY_PROFILE_FLAGS = {
+    rb"Flex Central Switching\s*:\s*ENABLED": 'central_switching',
+    rb"RADIUS Profiling\s*:\s*ENABLED": 'RADIUS',
+    rb"HTTP TLV caching\s*:\s*ENABLED": 'HTTP',
+    rb"DHCP TLV caching\s*:\s*ENABLED": 'DHCP',
+}
+
+# Comandos indentados de um 'ap dot11 <banda> rf-profile <nome>'
+RF_PROFILE_FIELDS = {
+    b'tx-power min': 'tx_power_min',
+    b'tx-power max': 'tx_power_max',
+    b'high-density rx-sop threshold': 'rx_sop',
+    b'channel chan-width minimum': 'channel_width_min',
+    b'channel chan-width maximum': 'channel_width_max',
+}
+
+RF_PROFILE_TOKENS = re.compile(
+    rb"^\s+(?:(" + b"|".join(map(re.escape, RF_PROFILE_FIELDS)) + rb")\s+(.*)"
+    rb"|(channel chan-width best)"
+    rb"|rate (\S+) (mandatory|supported))", re.MULTILINE)
 
 
 class ShowTechWireless:
     def __init__(self, show_tech_data):
+        """
+        :param show_tech_data: Conteúdo do show tech, como texto (str) ou como
+            bytes/mmap. O texto é codificado uma única vez em UTF-8; todos os
+            extratores trabalham sobre bytes e decodificam só os campos capturados.
+        """
+        if isinstance(show_tech_data, str):
+            show_tech_data = show_tech_data.encode(ENCODING, 'replace')
         self.data = show_tech_data
+        self._sections = None
+        self._span_digests = {}
+        self._global_config = {}
+        self._config_tree = None
+
+    @classmethod
+    def from_path(cls, path):
+        """
+        Abre o arquivo de show tech mapeado em memória (mmap), sem lê-lo para
+        uma string Python. As páginas são carregadas sob demanda pelo sistema
+        operacional, então o consumo de memória fica limitado ao tamanho do
+        arquivo e é compartilhado com o cache de disco.
+        """
+        with open(path, 'rb') as file:
+            try:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # mmap não aceita arquivos vazios
+                buffer = b''
+        return cls(buffer)
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def _decode(value):
+        return value.decode(ENCODING, 'replace')
+
+    @property
+    def sections(self):
+        """
+        Índice das seções do show tech, construído numa única passada
+        na primeira consulta.
+
+        Returns:
+            dict: Nome do comando ('show running-config', ...) mapeado para
+                  a lista de intervalos (início, fim) da sua saída em self.data.
+        """
+        if self._sections is None:
+            self._sections = self._index_sections()
+        return self._sections
+
+    def _index_sections(self):
+        data = self.data
+        headers = []
+        pos = data.find(SECTION_MARKER)
+        while pos != -1:
+            line_end = data.find(b'\n', pos)
+            if line_end == -1:
+                line_end = len(data)
+            header = SECTION_HEADER.match(data, pos, line_end)
+            # Só conta como cabeçalho quando o marcador abre a linha
+            if header and (pos == 0 or data[pos - 1:pos] == b'\n'):
+                command = ' '.join(self._decode(header.group(1)).split())
+                headers.append((command, pos, min(line_end + 1, len(data))))
+            pos = data.find(SECTION_MARKER, line_end)
+
+        index = {}
+        for i, (command, _, body_start) in enumerate(headers):
+            body_end = headers[i + 1][1] if i + 1 < len(headers) else len(data)
+            index.setdefault(command, []).append((body_start, body_end))
+        return index
+
+    def _spans(self, extractor, fallback=True):
+        """
+        Intervalos de self.data que o extrator deve analisar.
+
+        Se nenhuma das seções do extrator existir no arquivo (ex.: um arquivo
+        contendo apenas o running-config), retorna o arquivo inteiro quando
+        fallback=True, ou uma lista vazia caso contrário.
+        """
+        commands = EXTRACTOR_SECTIONS.get(extractor)
+        if commands is None:
+            return [(0, len(self.data))]
+
+        spans = []
+        for command, command_spans in self.sections.items():
+            if any(command == name or command.startswith(name + ' ') for name in commands):
+                spans.extend(command_spans)
+        if not spans and fallback:
+            return [(0, len(self.data))]
+        return sorted(spans)
+
+    def _span_digest(self, start, end):
+        digest = self._span_digests.get((start, end))
+        if digest is None:
+            with memoryview(self.data) as view:
+                digest = hashlib.sha256(view[start:end]).digest()
+            self._span_digests[(start, end)] = digest
+        return digest
+
+    def extractor_key(self, extractor):
+        """
+        Chave de cache do resultado de um extrator neste arquivo: SHA-256 da
+        versão do parser, do nome do extrator e do conteúdo exato das seções
+        que ele lê. Cada seção é lida e hasheada uma única vez, mesmo quando
+        vários extratores a compartilham (ex.: o running-config).
+        """
+        digest = hashlib.sha256(f'{PARSER_VERSION}:{extractor}'.encode())
+        for start, end in self._spans(extractor):
+            digest.update(self._span_digest(start, end))
+        return digest.hexdigest()
+
+    def _search(self, pattern, extractor):
+        for start, end in self._spans(extractor):
+            match = pattern.search(self.data, start, end)
+            if match:
+                return match
+        return None
+
+    def _findall(self, pattern, extractor):
+        """ Como re.findall, mas já devolvendo os grupos capturados decodificados. """
+        matches = []
+        for start, end in self._spans(extractor):
+            for match in pattern.findall(self.data, start, end):
+                if isinstance(match, tuple):
+                    matches.append(tuple(map(self._decode, match)))
+                else:
+                    matches.append(self._decode(match))
+        return matches
+
+    def _finditer(self, pattern, extractor):
+        for start, end in self._spans(extractor):
+            yield from pattern.finditer(self.data, start, end)
+
+    @property
+    def config_tree(self):
+        """
+        config_tree.ConfigTree do running-config, construída numa única
+        passada na primeira consulta e compartilhada pelos extratores de blocos
+        (WLANs, grupos RADIUS, RF profiles).
+        """
+        if self._config_tree is None:
+            self._config_tree = ConfigTree(self.data, self._spans('get_wlan'))
+        return self._config_tree
+
+    def _global_config_matches(self, name):
+        """
+        Ocorrências do padrão GLOBAL_CONFIG_PATTERNS[name] no running-config,
+        como re.Match, na ordem do arquivo (como em finditer). Só esse padrão
+        é procurado, na primeira consulta, e o resultado fica guardado para as
+        seguintes.
+        """
+        matches = self._global_config.get(name)
+        if matches is None:
+            pattern = GLOBAL_CONFIG_PATTERNS[name]
+            matches = [match for start, end in self._spans('get_hostname')
+                       for match in pattern.finditer(self.data, start, end)]
+            self._global_config[name] = matches
+        return matches
+
+    def _global_config_search(self, name):
+        """ Como _search, para um padrão de GLOBAL_CONFIG_PATTERNS. """
+        matches = self._global_config_matches(name)
+        return matches[0] if matches else None
+
+    def _global_config_findall(self, name):
+        """ Como _findall, para um padrão de GLOBAL_CONFIG_PATTERNS. """
+        found = []
+        for match in self._global_config_matches(name):
+            groups = match.groups()
+            if len(groups) == 1:
+                found.append(self._decode(groups[0]))
+            else:
+                found.append(tuple(map(self._decode, groups)))
+        return found
+
+    def _lines(self, start, end):
+        """
+        Itera as linhas (bytes, sem o '\\n' nem o '\\r' de arquivos CRLF) de
+        self.data[start:end] sem dividir o texto todo.
+        """
+        data = self.data
+        while start < end:
+            line_end = data.find(b'\n', start, end)
+            if line_end == -1:
+                line_end = end
+            if line_end > start and data[line_end - 1] == 13:  # '\r'
+                yield data[start:line_end - 1]
+            else:
+                yield data[start:line_end]
+            start = line_end + 1
+
+    def _parse_policy_profile(self, data, start, end):
+        """
+        Analisa o Policy Profile em data[start:end] numa única varredura de
+        POLICY_PROFILE_TOKENS, despachando cada par 'Chave : Valor' pelas
+        tabelas POLICY_PROFILE_*.
+
+        Returns:
+            tuple: (dicionário campo -> valor decodificado, conjunto de flags encontradas)
+        """
+        values = {}
+        flags = {flag for text, flag in POLICY_PROFILE_FLAGS.items() if data.find(text, start, end) != -1}
+
+        pos = start
+        while True:
+            match = POLICY_PROFILE_TOKENS.search(data, pos, end)
+            if not match:
+                break
+            token = match.group(1)
+            pos = match.end()
+            field = POLICY_PROFILE_FIELDS.get(token)
+            if field:
+                # O valor pode avançar para a linha seguinte quando vazio, mas a
+                # varredura continua logo após a chave
+                if field not in values:  # vale a primeira ocorrência
+                    value_match = FIELD_VALUE.match(data, pos, end)
+                    if value_match:
+                        values[field] = self._decode(value_match.group(1)).strip()
+            else:
+                for pattern, field in POLICY_PROFILE_QOS_FIELDS[token.rstrip()]:
+                    if field not in values:
+                        qos_match = pattern.match(data, pos, end)
+                        if qos_match:
+                            values[field] = self._decode(qos_match.group(1)).strip()
+
+        return values, flags
+
+    def _parse_rf_profile(self, data, start, end):
+        """
+        Analisa o RF Profile em data[start:end] numa única varredura de
+        RF_PROFILE_TOKENS, despachando os comandos indentados pela tabela
+        RF_PROFILE_FIELDS.
+
+        Returns:
+            tuple: (dicionário campo -> valor, taxas mandatory, taxas supported, chan-width best?)
+        """
+        values = {}
+        mandatory_rates = []
+        supported_rates = []
+        chan_width_best = False
+
+        pos = start
+        while True:
+            match = RF_PROFILE_TOKENS.search(data, pos, end)
+            if not match:
+                break
+            if match.group(1):
+                field = RF_PROFILE_FIELDS[match.group(1)]
+                if field not in values:  # vale a primeira ocorrência
+                    values[field] = self._decode(match.group(2)).strip()
+                pos = match.end(1)
+            elif match.group(3):
+                chan_width_best = True
+                pos = match.end()
+            else:
+                rates = mandatory_rates if match.group(5) == b'mandatory' else supported_rates
+                rates.append(self._decode(match.group(4)))
+                pos = match.end()
+
+        return values, mandatory_rates, supported_rates, chan_width_best
+
+    def _blocks(self, start_pattern, extractor, fallback=True):
+        """
+        Divide as seções do extrator em blocos sem copiar o texto.
+
+        Produz os mesmos pedaços que re.split(start_pattern, seção), mas como
+        intervalos (início, fim) de self.data, para que os campos de cada bloco
+        sejam buscados com pattern.search(self.data, início, fim). start_pattern
+        deve ser um lookahead (?=...), que marca o início de cada bloco.
+        """
+        for start, end in self._spans(extractor, fallback):
+            block_start = start
+            for match in start_pattern.finditer(self.data, start, end):
+                yield block_start, match.start()
+                block_start = match.start()
+            yield block_start, end
+
+    def _is_blank(self, start, end):
+        return NON_SPACE.search(self.data, start, end) is None
 
     def get_hostname(self):
-        match = re.search(r'hostname\s+(\S+)', self.data)
+        match = self._global_config_search('hostname')
         if match:
-            return match.group(1)
+            return self._decode(match.group(1))
         return None
 
     def get_wlc_ip(self):
-        match = re.search(
-            r'------------------\s*show\s+ip\s+interface\s+brief\s*------------------(.*?)------------------',
-            self.data, re.DOTALL)
-        if match:
-            interface_data = match.group(1)  # Extract the section after "show ip interface brief"
-
-            # Now, we need to look for IP address and interface within this section
-            ip_match = re.findall(r'(\S+)\s+(\d+\.\d+\.\d+\.\d+)\s+.*', interface_data)
-
-            if ip_match:
-                return ip_match
+        # Procura IPs e interfaces apenas na seção "show ip interface brief"
+        ip_match = []
+        for start, end in self._spans('get_wlc_ip', fallback=False):
+            for interface, ip in WLC_IP.findall(self.data, start, end):
+                ip_match.append((self._decode(interface), self._decode(ip)))
+
+        if ip_match:
+            return ip_match
         return None
 
     def get_version(self):
-        match = re.search(r'Cisco\s+IOS\s+XE\s+Software,\s+Version\s+(\S+)', self.data)
-        if match:
-            version = match.group(1)
-            if "C9800-CL" in self.data:
-                return version, "Virtual Controller"
-            return version, "Physical Controller"
+        for start, end in self._spans('get_version'):
+            match = VERSION.search(self.data, start, end)
+            if match:
+                version = self._decode(match.group(1))
+                if self.data.find(b"C9800-CL", start, end) != -1:
+                    return version, "Virtual Controller"
+                return version, "Physical Controller"
         return None
 
     def get_policy_tag(self):
         policy_tags = []
 
         # Regex para capturar as Policy Tags, Descrições e a Tabela de WLAN Profile e Policy Name
-        pattern = r"Policy Tag Name\s*:\s*(\S+)\s*Description\s*:\s*([\w\s]*)\s*Number of WLAN-POLICY maps\s*:\s*(\d+)\s*([\s\S]*?)(?=\n\s*Policy Tag Name|\Z)"
-        matches = re.findall(pattern, self.data)
+        matches = self._findall(POLICY_TAG, 'get_policy_tag')
 
         for match in matches:
             tag_name = match[0]
@@ -74,8 +546,7 @@ class ShowTechWireless:
         rf_tags = []
 
         # Regex para capturar as RF Tags e os RF Policies associados (6GHz, 5GHz, 2.4GHz)
-        pattern = r"Tag Name\s*:\s*(\S+)\s*Description\s*:\s*([\w\s]*)\s*-{30,}\s*6ghz RF Policy\s*:\s*(\S+)\s*5ghz RF Policy\s*:\s*(\S+)\s*2.4ghz RF Policy\s*:\s*(\S+)"
-        matches = re.findall(pattern, self.data)
+        matches = self._findall(RF_TAG, 'get_rf_tag')
 
         for match in matches:
             tag_name = match[0]
@@ -103,22 +574,16 @@ class ShowTechWireless:
         """
         rf_profiles_list: list = []
 
-        # Regex para dividir o texto em blocos, cada um começando com "ap dot11"
-        # Usa um "positive lookahead" para não consumir o delimitador.
-        profile_blocks = re.split(r'(?=ap dot11 \S+ rf-profile)', self.data)
-
-        for block in profile_blocks:
-            # Pula blocos vazios ou que não são de um perfil de RF
-            if not block.strip() or not block.startswith("ap dot11"):
-                continue
-
+        # Percorre os blocos "ap dot11 ..." do running-config; cada bloco tem a
+        # linha do comando e os subcomandos indentados do perfil
+        for start, end in self.config_tree.blocks(b'ap dot11'):
             # Extrai a linha principal para obter nome e frequência
-            header_match = re.match(r"ap dot11 (\S+) rf-profile (\S+)", block)
+            header_match = RF_PROFILE_HEADER.match(self.data, start, end)
             if not header_match:
                 continue
 
-            frequency_band = header_match.group(1)
-            profile_name = header_match.group(2)
+            frequency_band = self._decode(header_match.group(1))
+            profile_name = self._decode(header_match.group(2))
 
             # Dicionário para armazenar os detalhes do perfil atual
             profile_details = {
@@ -133,39 +598,24 @@ class ShowTechWireless:
                 'supported_rates': []
             }
 
-            # --- Função auxiliar para extrair valores simples ---
-            def extract_value(pattern, default='N/A'):
-                match = re.search(pattern, block, re.MULTILINE)
-                return match.group(1).strip() if match else default
-
-            # 1. Extrair Potência, Largura de Canal e RX-SOP
-            profile_details['tx_power_min'] = extract_value(r"^\s+tx-power min\s+(.*)")
-            profile_details['tx_power_max'] = extract_value(r"^\s+tx-power max\s+(.*)")
-            profile_details['rx_sop'] = extract_value(r"^\s+high-density rx-sop threshold\s+(.*)")
+            # 1. Percorre as linhas do bloco uma única vez: potência, largura
+            # de canal, RX-SOP e taxas de dados (Data Rates)
+            values, mandatory_rates, supported_rates, chan_width_best = self._parse_rf_profile(self.data, start, end)
+            profile_details['tx_power_min'] = values.get('tx_power_min', 'N/A')
+            profile_details['tx_power_max'] = values.get('tx_power_max', 'N/A')
+            profile_details['rx_sop'] = values.get('rx_sop', 'N/A')
 
             # Lógica especial para largura de canal
-            chan_width_min_match = extract_value(r"^\s+channel chan-width minimum\s+(.*)")
-            chan_width_max_match = extract_value(r"^\s+channel chan-width maximum\s+(.*)")
-            chan_width_best_match = re.search(r"^\s+channel chan-width best", block, re.MULTILINE)
-
-            if chan_width_best_match:
+            if chan_width_best:
                 profile_details['channel_width_min'] = "best"
                 profile_details['channel_width_max'] = "best"
             else:
-                profile_details['channel_width_min'] = chan_width_min_match
-                profile_details['channel_width_max'] = chan_width_max_match
-
-            # 2. Extrair Taxas de Dados (Data Rates)
-            rate_matches = re.findall(r"^\s+rate (\S+) (mandatory|supported)", block, re.MULTILINE)
-            for rate, status in rate_matches:
-                if status == 'mandatory':
-                    profile_details['mandatory_rates'].append(rate)
-                elif status == 'supported':
-                    profile_details['supported_rates'].append(rate)
+                profile_details['channel_width_min'] = values.get('channel_width_min', 'N/A')
+                profile_details['channel_width_max'] = values.get('channel_width_max', 'N/A')
 
-            # Converte as listas de taxas em strings para fácil exibição
-            profile_details['mandatory_rates'] = ', '.join(profile_details['mandatory_rates']) or 'N/A'
-            profile_details['supported_rates'] = ', '.join(profile_details['supported_rates']) or 'N/A'
+            # 2. Converte as listas de taxas em strings para fácil exibição
+            profile_details['mandatory_rates'] = ', '.join(mandatory_rates) or 'N/A'
+            profile_details['supported_rates'] = ', '.join(supported_rates) or 'N/A'
 
             rf_profiles_list.append(profile_details)
 
@@ -186,51 +636,41 @@ class ShowTechWireless:
         """
         site_tags_list = []
 
-        # 1. Isola a seção inteira de 'show wireless tag site all' do arquivo.
-        # A regex (.*?) captura todo o texto entre o cabeçalho e o próximo
-        # cabeçalho de 'show', garantindo que peguemos apenas esta seção.
-        show_tag_section_match = re.search(
-            r'------------------ show wireless tag site all ------------------\n(.*?)(?=\n------------------ show)',
-            self.data,
-            re.DOTALL
-        )
-
-        # Se a seção não for encontrada no arquivo, retorna uma lista vazia.
-        if not show_tag_section_match:
-            return []
-
-        tag_data_section = show_tag_section_match.group(1)
-
+        # 1. Usa apenas a seção 'show wireless tag site all' do índice de seções
+        # (se ela não existir no arquivo, não há blocos e a lista fica vazia).
         # 2. Divide a seção em múltiplos blocos, um para cada "Site Tag Name".
         # O "lookahead" (?=...) é usado como delimitador para não remover o
         # "Site Tag Name" ao dividir o texto.
-        tag_blocks = re.split(r'(?=Site Tag Name\s*:)', tag_data_section)
+        data = self.data
 
         # 3. Inicia o loop para processar cada bloco de Site Tag individualmente.
-        for block in tag_blocks:
+        for start, end in self._blocks(SITE_TAG_START, 'get_site_tag', fallback=False):
             # Pula blocos vazios ou de cabeçalho que não contêm dados de uma tag.
-            if not block.strip() or "Site Tag Name" not in block:
+            if self._is_blank(start, end) or data.find(b"Site Tag Name", start, end) == -1:
                 continue
 
             # Para cada bloco, busca por cada um dos campos de interesse.
-            name_match = re.search(r"Site Tag Name\s*:\s*(.*)", block)
-            desc_match = re.search(r"Description\s*:\s*(S*)", block)
-            flex_match = re.search(r"Flex Profile\s*:\s*(.*)", block)
-            ap_match = re.search(r"AP Profile\s*:\s*(.*)", block)
-            local_site_match = re.search(r"Local-site\s*:\s*(.*)", block)
+            name_match = SITE_TAG_NAME.search(data, start, end)
+            desc_match = SITE_TAG_DESCRIPTION.search(data, start, end)
+            flex_match = SITE_TAG_FLEX_PROFILE.search(data, start, end)
+            ap_match = SITE_TAG_AP_PROFILE.search(data, start, end)
+            local_site_match = SITE_TAG_LOCAL_SITE.search(data, start, end)
 
             # 4. Constrói o dicionário para a tag atual.
             # Para cada campo, verifica se a busca encontrou um resultado (match).
             # Se sim, usa o valor encontrado (.group(1).strip()).
             # Se não, ou se o valor for vazio, define como 'N/A'.
             # Isso trata elegantemente os campos opcionais como o Flex Profile.
+            def field(match):
+                value = self._decode(match.group(1)).strip() if match else ''
+                return value or 'N/A'
+
             tag_details = {
-                'name': name_match.group(1).strip() if name_match and name_match.group(1).strip() else 'N/A',
-                'description': desc_match.group(1).strip() if desc_match and desc_match.group(1).strip() else 'N/A',
-                'flex_profile': flex_match.group(1).strip() if flex_match and flex_match.group(1).strip() else 'N/A',
-                'ap_profile': ap_match.group(1).strip() if ap_match and ap_match.group(1).strip() else 'N/A',
-                'local_site': local_site_match.group(1).strip() if local_site_match and local_site_match.group(
-                    1).strip() else 'N/A',
+                'name': field(name_match),
+                'description': field(desc_match),
+                'flex_profile': field(flex_match),
+                'ap_profile': field(ap_match),
+                'local_site': field(local_site_match),
             }
 
             # Adiciona o dicionário populado à lista final.
@@ -251,21 +691,14 @@ class ShowTechWireless:
         """
         flex_profiles_list = []
 
-        # 1. Isola a seção inteira de 'show wireless profile flex all' do arquivo.
-        show_flex_section_match = re.search(
-            r'-+\s+show\s+wireless\s+profile\s+flex\s+all\s+-+(.*?)(?=\n------------------ show)',
-            self.data,
-            re.DOTALL
-        )
-
-        flex_data_section = show_flex_section_match.group(1)
-
-        # 2. Divide a seção em blocos, um para cada "Flex Profile Name".
-        profile_blocks = re.split(r'(?=Flex Profile Name\s*:)', flex_data_section)
+        # 1. Usa apenas a seção 'show wireless profile flex all' do índice de seções
+        # 2. e a divide em blocos, um para cada "Flex Profile Name".
+        data = self.data
 
         # 3. Inicia o loop para processar cada bloco de Flex Profile.
-        for block in profile_blocks:
-            if not block.strip() or "Flex Profile Name" not in block or 'AP PMK propagation' in block:
+        for start, end in self._blocks(FLEX_PROFILE_START, 'get_flex_profile', fallback=False):
+            if (self._is_blank(start, end) or data.find(b"Flex Profile Name", start, end) == -1
+                    or data.find(b'AP PMK propagation', start, end) != -1):
                 continue
 
             # Dicionário com valores padrão para cada perfil
@@ -277,29 +710,23 @@ class ShowTechWireless:
             }
 
             # Extrai o nome do perfil e a Native VLAN ID
-            name_match = re.search(r"Flex Profile Name\s*:\s*(.*)", block)
+            name_match = FLEX_PROFILE_NAME.search(data, start, end)
             if name_match:
-                profile_details['name'] = name_match.group(1).strip()
+                profile_details['name'] = self._decode(name_match.group(1)).strip()
 
-            native_vlan_match = re.search(r"Native vlan ID\s*:\s*(\d+)", block)
+            native_vlan_match = FLEX_NATIVE_VLAN.search(data, start, end)
             if native_vlan_match:
-                profile_details['native_vlan_id'] = native_vlan_match.group(1).strip()
+                profile_details['native_vlan_id'] = self._decode(native_vlan_match.group(1)).strip()
 
             # 4. Extrai as Policy ACLs
-            policy_acl_section_match = re.search(
-                r'Policy ACL\s*:\s*\n(.*?)(?=VLAN Name - VLAN ID mapping|HTTP-Proxy)',
-                block,
-                re.DOTALL
-            )
+            policy_acl_section_match = FLEX_POLICY_ACL.search(data, start, end)
             if policy_acl_section_match:
-                acl_block = policy_acl_section_match.group(1)
-
                 # Captura a primeira palavra de cada linha no bloco de ACLs
-                all_first_words = re.findall(r'^\s*(\S+)', acl_block, re.MULTILINE)
+                all_first_words = FIRST_WORD.findall(data, *policy_acl_section_match.span(1))
 
                 # Filtra a lista para manter apenas os nomes de ACL válidos
                 acls = ''
-                for word in all_first_words:
+                for word in map(self._decode, all_first_words):
                     # Adiciona a palavra à lista somente se NÃO for um cabeçalho
                     # e NÃO for uma linha de separação (composta apenas por traços)
                     if word.upper() not in ['ACL', 'NAME'] and not all(c == '-' for c in word):
@@ -309,18 +736,13 @@ class ShowTechWireless:
 
             # 5. Extrai o Mapeamento de VLANs
             # Isola a subseção de VLAN Name - VLAN ID mapping
-            vlan_mapping_section_match = re.search(
-                r'VLAN Name - VLAN ID mapping\s*:\s*\n(.*?)(?=HTTP-Proxy)',
-                block,
-                re.DOTALL
-            )
+            vlan_mapping_section_match = FLEX_VLAN_MAPPING.search(data, start, end)
             if vlan_mapping_section_match:
-                mapping_block = vlan_mapping_section_match.group(1)
                 # Encontra todos os pares de Nome de VLAN e ID de VLAN
-                mappings = re.findall(r'^\s*(\S+)\s+(\d+)', mapping_block, re.MULTILINE)
+                mappings = VLAN_ID_PAIR.findall(data, *vlan_mapping_section_match.span(1))
                 vlan_id = ''
-                for mapping in mappings:
-                    vlan_id += f'{mapping[0]}: {mapping[1]}\n'
+                for name, vlan in mappings:
+                    vlan_id += f'{self._decode(name)}: {self._decode(vlan)}\n'
                 profile_details['vlan_mappings'] = vlan_id
 
             flex_profiles_list.append(profile_details)
@@ -330,36 +752,27 @@ class ShowTechWireless:
     def get_ap_tag(self):
         ap_tags = []
 
-        # Dividir o conteúdo em linhas
-        lines = self.data.splitlines()
-
-        # Encontrar a linha que contém "show ap tag summary"
-        start_index = -1
-        for i, line in enumerate(lines):
-            if "show ap tag summary" in line:
-                start_index = i
-                break
-
-        if start_index == -1:
+        # Percorre apenas as linhas da seção "show ap tag summary"
+        spans = self._spans('get_ap_tag', fallback=False)
+        if not spans:
             return ap_tags  # Se não encontrar a sessão, retorna lista vazia
 
-        # A partir do start_index, começamos a capturar os dados dos APs
-        # Ignoramos as linhas do cabeçalho até o divisor
-        for i in range(start_index + 1, len(lines)):
-            line = lines[i].strip()
+        # Capturamos os dados dos APs ignorando as linhas do cabeçalho
+        for line in itertools.chain.from_iterable(self._lines(start, end) for start, end in spans):
+            line = line.strip()
 
             # Ignorar linha de cabeçalho ou qualquer linha irrelevante
-            if line.startswith("AP Name") or line.startswith("Number of APs") or line.startswith(
-                    "----------------------------------------------------------------"):
+            if line.startswith(b"AP Name") or line.startswith(b"Number of APs") or line.startswith(
+                    b"----------------------------------------------------------------"):
                 continue
 
             # Procurar pelo divisor de linhas (------------------)
-            if line.startswith("------------------"):
+            if line.startswith(b"------------------"):
                 break  # Interrompe a busca quando encontra o divisor
 
             # Para as linhas dos APs, dividimos a linha em campos
-            fields = line.split()
-            if len(fields) >= 6:  # Garantimos que estamos capturando a linha com os dados corretos
+            fields = self._decode(line).split()
+            if len(fields) >= 7:  # Garantimos que a linha tem todos os campos, até o Tag Source
                 ap_name = fields[0]
                 ap_mac = fields[1]
                 site_tag_name = fields[2]
@@ -381,7 +794,7 @@ class ShowTechWireless:
 
     def get_snmp(self):
         communities = []
-        match = re.findall(r'snmp-server\s+community\s+(\S+)\s+(\S+)', self.data)
+        match = self._global_config_findall('snmp_community')
         for entry in match:
             communities.append({
                 "community": entry[0],
@@ -391,7 +804,7 @@ class ShowTechWireless:
 
     def get_snmp_trap(self):
         communities = []
-        match = re.findall(r'snmp-server\s+host\s+([0-9]+.[0-9]+.[0-9]+.[0-9]+)', self.data)
+        match = self._global_config_findall('snmp_trap')
         for entry in match:
             communities.append(entry)
         return communities
@@ -399,7 +812,7 @@ class ShowTechWireless:
 
     def get_loggin(self):
         servers = []
-        match = re.findall(r'logging\s+host\s+([0-9]+.[0-9]+.[0-9]+.[0-9]+)', self.data)
+        match = self._global_config_findall('logging_host')
         for entry in match:
             servers.append({
                 "server": entry[0],
@@ -407,16 +820,16 @@ class ShowTechWireless:
         return servers
 
     def get_ntp(self):
-        match = re.findall(r'ntp\s+ip\s+(\S+)', self.data)
+        match = self._global_config_findall('ntp')
         return match if match else None
 
     def get_dns(self):
-        match = re.findall(r'ip\s+name-server\s+(\S+)', self.data)
-        domain_match = re.search(r'ip\s+domain\s+name\s+(\S+)', self.data)
-        dns_lookup_match = re.search(r'no\s+dns-lookups', self.data)
+        match = self._global_config_findall('name_server')
+        domain_match = self._global_config_search('domain_name')
+        dns_lookup_match = self._global_config_search('no_dns_lookup')
         dns_info = {
             "name-servers": match,
-            "domain": domain_match.group(1) if domain_match else None,
+            "domain": self._decode(domain_match.group(1)) if domain_match else None,
             "dns-lookup-configured": not bool(dns_lookup_match)
         }
         return dns_info
@@ -424,44 +837,43 @@ class ShowTechWireless:
     def get_acl(self):
         acl_list = []
 
-        # Split the input data into lines for easier processing
-        lines = self.data.splitlines()
-
         acl_name = None
         acl_commands = []
 
-        # Process each line
-        for line in lines:
-            line = line.strip()  # Remove any leading/trailing spaces
-
-            # Skip lines that are separators or headers
-            if line.startswith("------------------"):
-                # If we have collected an ACL, store it and reset
-                if acl_name:
-                    acl_list.append({
-                        "acl_name": acl_name,
-                        "acl_command": " ".join(acl_commands)  # Join the commands with space
-                    })
-                    acl_name = None
-                    acl_commands = []  # Reset the commands for the next ACL
-                continue  # Skip the separator line
-
-            # Check if the line indicates a new ACL (starts with "Extended IP access list")
-            elif line.startswith("Extended IP access list"):
-                # If we already have a previous ACL, store it
-                if acl_name:
-                    acl_list.append({
-                        "acl_name": acl_name,
-                        "acl_command": " ".join(acl_commands)  # Join the commands with space
-                    })
-
-                # Get the new ACL name from the line (after "Extended IP access list ")
-                acl_name = line.split("Extended IP access list ")[-1].strip()
-                acl_commands = []  # Reset the list for the new ACL
-
-            # Check if the line is a command line (lines starting with a number)
-            elif line and line[0].isdigit():  # Check if the line starts with a number (indicating an ACL rule)
-                acl_commands.append(f'{line}\n')
+        # Process each line of the access-list sections (or of the whole file
+        # when they are missing). The end of each section acts as a separator.
+        for start, end in self._spans('get_acl'):
+            for line in itertools.chain(self._lines(start, end), [b"------------------"]):
+                line = line.strip()  # Remove any leading/trailing spaces
+
+                # Skip lines that are separators or headers
+                if line.startswith(b"------------------"):
+                    # If we have collected an ACL, store it and reset
+                    if acl_name:
+                        acl_list.append({
+                            "acl_name": acl_name,
+                            "acl_command": " ".join(acl_commands)  # Join the commands with space
+                        })
+                        acl_name = None
+                        acl_commands = []  # Reset the commands for the next ACL
+                    continue  # Skip the separator line
+
+                # Check if the line indicates a new ACL (starts with "Extended IP access list")
+                elif line.startswith(b"Extended IP access list"):
+                    # If we already have a previous ACL, store it
+                    if acl_name:
+                        acl_list.append({
+                            "acl_name": acl_name,
+                            "acl_command": " ".join(acl_commands)  # Join the commands with space
+                        })
+
+                    # Get the new ACL name from the line (after "Extended IP access list ")
+                    acl_name = self._decode(line.split(b"Extended IP access list ")[-1].strip())
+                    acl_commands = []  # Reset the list for the new ACL
+
+                # Check if the line is a command line (lines starting with a number)
+                elif line[:1].isdigit():  # Check if the line starts with a number (indicating an ACL rule)
+                    acl_commands.append(f'{self._decode(line)}\n')
 
         # Don't forget to add the last ACL processed if it exists
         if acl_name:
@@ -474,7 +886,7 @@ class ShowTechWireless:
 
     def get_radius_server(self):
         radius_servers = []
-        match = re.findall(r'radius\s+server\s+(\S+)\s+address\s+ipv4\s+(\S+)\s+auth-port\s+(\S+)\s+acct-port\s+(\S+)', self.data)
+        match = self._global_config_findall('radius_server')
         for entry in match:
             radius_servers.append({
                 "name": entry[0],
@@ -498,19 +910,18 @@ class ShowTechWireless:
         """
         groups = []
 
-        # Regex para encontrar cada bloco de configuração de grupo RADIUS.
-        # Captura:
-        # Grupo 1: O nome do grupo (\S+)
-        # Grupo 2: Todo o bloco de configuração indentado que se segue ((?:^\s+.*\n?)*)
-        pattern = re.compile(r"aaa\s+group\s+server\s+radius\s+(\S+)\n((?:^\s+.*\n?)*)", re.MULTILINE)
-
-        # Itera sobre cada bloco de grupo encontrado no texto
-        for match in pattern.finditer(self.data):
-            group_name = match.group(1)
-            config_block = match.group(2)
+        # Itera sobre os blocos "aaa group server radius" do running-config.
+        # RADIUS_GROUP_HEADER captura o nome do grupo na linha do comando; o
+        # restante do bloco são os subcomandos indentados.
+        for start, end in self.config_tree.blocks(b'aaa group server radius'):
+            match = RADIUS_GROUP_HEADER.match(self.data, start, end)
+            if not match:
+                continue
+            group_name = self._decode(match.group(1))
 
             # Agora, dentro do bloco de configuração, encontra todos os servidores
-            servers = re.findall(r"^\s+server\s+name\s+(\S+)", config_block, re.MULTILINE)
+            servers = [self._decode(server) for server in
+                       RADIUS_GROUP_SERVER.findall(self.data, match.end(), end)]
 
             groups.append({
                 "group": group_name,
@@ -521,21 +932,21 @@ class ShowTechWireless:
 
     def get_tacacs_server(self):
         tacacs_servers = []
-        match = re.findall(r'tacacs-server\s+server\s+(\S+)', self.data)
+        match = self._global_config_findall('tacacs_server')
         for server in match:
             tacacs_servers.append({"server": server})
         return tacacs_servers
 
     def get_tacacs_group(self):
         groups = []
-        match = re.findall(r'tacacs-server\s+group\s+(\S+)', self.data)
+        match = self._global_config_findall('tacacs_group')
         for group in match:
             groups.append({"group": group})
         return groups
 
     def get_method_list(self):
         methods = []
-        match = re.findall(r'phase\s+(\S+)\s+name\s+(\S+)\s+type\s+(\S+)\s+group\s+(\S+)', self.data)
+        match = self._global_config_findall('method_list')
         for phase, name, type_, group in match:
             methods.append({
                 "phase": phase,
@@ -559,19 +970,19 @@ class ShowTechWireless:
         """
         wlan_list = []
 
-        # Regex para encontrar cada bloco de configuração de WLAN.
-        # Captura:
+        # Percorre os blocos "wlan" do running-config. WLAN_HEADER captura:
         # Grupo 1: Profile Name (\S+)
         # Grupo 2: ID (\d+)
         # Grupo 3: SSID (\S+)
-        # Grupo 4: Todo o bloco de configuração indentado ((?:^\s+.*\n?)*)
-        pattern = re.compile(r"^wlan\s+(\S+)\s+(\d+)\s+(\S+)\n((?:^\s+.*\n?)*)", re.MULTILINE)
-
-        for match in pattern.finditer(self.data):
-            profile_name = match.group(1)
-            wlan_id = match.group(2)
-            ssid = match.group(3)
-            config_block = match.group(4)
+        # O bloco de configuração são as linhas indentadas abaixo do comando.
+        for start, end in self.config_tree.blocks(b'wlan'):
+            match = WLAN_HEADER.match(self.data, start, end)
+            if not match:
+                continue
+            profile_name = self._decode(match.group(1))
+            wlan_id = self._decode(match.group(2))
+            ssid = self._decode(match.group(3))
+            config_block = self.data[match.end():end]
 
             # Dicionário para armazenar os detalhes desta WLAN
             wlan_details = {
@@ -590,46 +1001,46 @@ class ShowTechWireless:
             # --- Análise dentro do bloco de configuração ---
 
             # 1. Extrair Políticas de Rádio
-            radio_24 = re.search(r"^\s+radio\s+policy\s+dot11\s+24ghz", config_block, re.MULTILINE)
+            radio_24 = re.search(rb"^\s+radio\s+policy\s+dot11\s+24ghz", config_block, re.MULTILINE)
             if radio_24:
                 wlan_details["24ghz"] = "Enable"
 
-            radio_5 = re.search(r"^\s+radio\s+policy\s+dot11\s+5ghz", config_block, re.MULTILINE)
+            radio_5 = re.search(rb"^\s+radio\s+policy\s+dot11\s+5ghz", config_block, re.MULTILINE)
             if radio_5:
                 wlan_details["5ghz"] = "Enable"
 
-            radio_6 = re.search(r"^\s+radio\s+policy\s+dot11\s+6ghz", config_block, re.MULTILINE)
+            radio_6 = re.search(rb"^\s+radio\s+policy\s+dot11\s+6ghz", config_block, re.MULTILINE)
             if radio_6:
                 wlan_details["6ghz"] = "Enable"
 
             # 2. Extrair Listas de Autenticação e Autorização
-            auth_list_match = re.search(r"^\s+security\s+dot1x\s+authentication-list\s+(\S+)", config_block,
+            auth_list_match = re.search(rb"^\s+security\s+dot1x\s+authentication-list\s+(\S+)", config_block,
                                         re.MULTILINE)
             if auth_list_match:
-                wlan_details["auth_list"] = auth_list_match.group(1)
+                wlan_details["auth_list"] = self._decode(auth_list_match.group(1))
 
-            authz_list_match = re.search(r"^\s+security\s+dot1x\s+authorization-list\s+(\S+)", config_block,
+            authz_list_match = re.search(rb"^\s+security\s+dot1x\s+authorization-list\s+(\S+)", config_block,
                                          re.MULTILINE)
             if authz_list_match:
-                wlan_details["authz_list"] = authz_list_match.group(1)
+                wlan_details["authz_list"] = self._decode(authz_list_match.group(1))
 
             # 3. Determinar o Método de Associação
-            if re.search(r"^\s+security\s+wpa\s+akm\s+psk", config_block, re.MULTILINE):
+            if re.search(rb"^\s+security\s+wpa\s+akm\s+psk", config_block, re.MULTILINE):
                 wlan_details["association_method"] = "PSK"
                 # Extrair a chave PSK, se houver
-                psk_match = re.search(r"^\s+security\s+wpa\s+psk\s+set-key\s+ascii\s+\d\s+(.*)", config_block,
+                psk_match = re.search(rb"^\s+security\s+wpa\s+psk\s+set-key\s+ascii\s+\d\s+(.*)", config_block,
                                       re.MULTILINE)
                 if psk_match:
-                    wlan_details["psk"] = psk_match.group(1).strip()
+                    wlan_details["psk"] = self._decode(psk_match.group(1)).strip()
 
-            elif re.search(r"^\s+security\s+wpa\s+akm\s+sae", config_block, re.MULTILINE):
+            elif re.search(rb"^\s+security\s+wpa\s+akm\s+sae", config_block, re.MULTILINE):
                 wlan_details["association_method"] = "SAE"
                 # Extrair a chave SAE (similar ao PSK)
-                sae_match = re.search(r"^\s+security\s+sae\s+set-key\s+ascii\s+\d\s+(.*)", config_block, re.MULTILINE)
+                sae_match = re.search(rb"^\s+security\s+sae\s+set-key\s+ascii\s+\d\s+(.*)", config_block, re.MULTILINE)
                 if sae_match:
-                    wlan_details["psk"] = sae_match.group(1).strip()  # Reutilizando campo PSK para simplificar
+                    wlan_details["psk"] = self._decode(sae_match.group(1)).strip()  # Reutilizando campo PSK para simplificar
 
-            elif re.search(r"^\s+security\s+(?:wpa\s+akm\s+)?dot1x", config_block, re.MULTILINE):
+            elif re.search(rb"^\s+security\s+(?:wpa\s+akm\s+)?dot1x", config_block, re.MULTILINE):
                 wlan_details["association_method"] = "802.1X"
 
             # Adiciona os detalhes da WLAN processada à lista final
@@ -638,113 +1049,38 @@ class ShowTechWireless:
         return wlan_list
 
     def get_ap_inventory(self):
-        ap_inventory = []
-
-        # Dividindo o conteúdo em linhas
-        lines = self.data.splitlines()
-
-        # Encontrando o começo da seção com "Cisco AP Name   :"
-        start_index = -1
-        for i, line in enumerate(lines):
-            if line.startswith("Cisco AP Name   :"):
-                start_index = i
-                break
-
-        if start_index == -1:
-            return ap_inventory  # Se não encontrar a sessão, retorna lista vazia
-
-        # Variáveis para armazenar os dados do AP atual
-        ap_name = ""
-        country_code = ""
-        ip_config = ""
-        ip_address = ""
-        ip_netmask = ""
-        gateway_ip = ""
-        ap_mode = ""
-        software_version = ""
-        ap_model = ""
-        ap_user_name = ""
-
-        # A partir do start_index, vamos começar a capturar os dados dos APs
-        for i in range(start_index, len(lines)):
-            line = lines[i].strip()
-
-            # Ignorar as linhas de divisores
-            if line.startswith("================================================="):
-                continue
-
-            # Quando encontrar um novo "Cisco AP Name", isso indica o começo de um novo AP
-            if line.startswith("Cisco AP Name   :"):
-                # Se já tivermos capturado dados de um AP, armazenamos
-                if ap_name:
-                    ap_inventory.append({
-                        "ap_name": ap_name,
-                        "country_code": country_code,
-                        "ip_config": ip_config,
-                        "ip_address": ip_address,
-                        "ip_netmask": ip_netmask,
-                        "gateway_ip": gateway_ip,
-                        "ap_mode": ap_mode,
-                        "software_version": software_version,
-                        "ap_model": ap_model,
-                        "ap_user_name": ap_user_name
-                    })
-
-                # Inicia a captura de um novo AP
-                ap_name = line.split(":")[1].strip()
-                country_code = ip_config = ip_address = ip_netmask = gateway_ip = ""
-                ap_mode = software_version = ap_model = ap_user_name = ""
-
-            # Captura o Country Code
-            elif line.startswith("Country Code") and ":" in line:
-                country_code = line.split(":")[1].strip()
-
-            # Captura a configuração do IP
-            elif line.startswith("IP Address Configuration") and ":" in line:
-                ip_config = line.split(":")[1].strip()
-
-            # Captura o IP Address
-            elif line.startswith("IP Address") and ":" in line:
-                ip_address = line.split(":")[1].strip()
-
-            # Captura o IP Netmask
-            elif line.startswith("IP Netmask") and ":" in line:
-                ip_netmask = line.split(":")[1].strip()
-
-            # Captura o Gateway IP Address
-            elif line.startswith("Gateway IP Address") and ":" in line:
-                gateway_ip = line.split(":")[1].strip()
-
-            # Captura o AP Model
-            elif line.startswith("AP Model") and ":" in line:
-                ap_model = line.split(":")[1].strip()
-
-            # Captura o AP Mode
-            elif line.startswith("AP Mode") and ":" in line:
-                ap_mode = line.split(":")[1].strip()
-
-            # Captura a Software Version
-            elif line.startswith("Software Version") and ":" in line:
-                software_version = line.split(":")[1].strip()
-
-            # Captura o AP User Name
-            elif line.startswith("AP User Name") and ":" in line:
-                ap_user_name = line.split(":")[1].strip()
+        # Guardado em colunas (ver ap_inventory.APInventory); itera como uma lista de dicts
+        ap_inventory = APInventory()
+
+        # Valores do AP atual, na ordem de APInventory.append
+        values = [""] * len(AP_INVENTORY_FIELDS)
+        # Os dados só contam a partir do primeiro "Cisco AP Name   :" no começo de uma linha
+        # (se a sessão não existir, nada é capturado e a lista fica vazia)
+        started = False
+
+        # Uma única regex percorre a seção "show ap config general" e só os
+        # campos capturados são decodificados
+        for start, end in self._spans('get_ap_inventory'):
+            for indent, field, value in AP_INVENTORY_LINE.findall(self.data, start, end):
+                index = AP_INVENTORY_FIELDS[field]
+
+                # Quando encontrar um novo "Cisco AP Name", isso indica o começo de um novo AP
+                if index == 0:
+                    if not started and indent:
+                        continue
+                    started = True
+
+                    # Se já tivermos capturado dados de um AP, armazenamos
+                    if values[0]:
+                        ap_inventory.append(*values)
+                    values = [""] * len(AP_INVENTORY_FIELDS)
+
+                if started:
+                    values[index] = self._decode(value.strip())
 
         # Após o loop, adiciona o último AP (pois ele não será adicionado dentro do loop)
-        if ap_name:
-            ap_inventory.append({
-                "ap_name": ap_name,
-                "country_code": country_code,
-                "ip_config": ip_config,
-                "ip_address": ip_address,
-                "ip_netmask": ip_netmask,
-                "gateway_ip": gateway_ip,
-                "ap_mode": ap_mode,
-                "software_version": software_version,
-                "ap_model": ap_model,
-                "ap_user_name": ap_user_name
-            })
+        if values[0]:
+            ap_inventory.append(*values)
 
         return ap_inventory
 
@@ -761,13 +1097,11 @@ class ShowTechWireless:
         """
         profiles_list = []
 
-        # Regex para dividir o texto em blocos, cada um começando com "Policy Profile Name"
-        # A expressão (?=...) é um "positive lookahead" que não consome o texto,
-        # permitindo que a próxima busca comece a partir dele.
-        profile_blocks = re.split(r'(?=Policy Profile Name\s*:)', self.data)
-
-        for block in profile_blocks:
-            if not block.strip() or "Policy Profile Name" not in block:
+        # Percorre os blocos, cada um começando com "Policy Profile Name".
+        # POLICY_PROFILE_START é um "positive lookahead" que não consome o texto,
+        # permitindo que o próximo bloco comece a partir dele.
+        for start, end in self._blocks(POLICY_PROFILE_START, 'get_policy_profile'):
+            if self._is_blank(start, end) or self.data.find(b"Policy Profile Name", start, end) == -1:
                 continue
 
             # Dicionário para armazenar os detalhes do perfil atual
@@ -787,40 +1121,18 @@ class ShowTechWireless:
                 'accounting_list': 'N/A'
             }
 
-            # --- Funções auxiliares para extrair valores ---
-            def extract_value(pattern, default='N/A'):
-                match = re.search(pattern, block, re.MULTILINE)
-                return match.group(1).strip() if match else default
-
-            # 1. Extrair os campos principais
-            profile_details['name'] = extract_value(r"Policy Profile Name\s*:\s*(.*)")
-            profile_details['vlan'] = extract_value(r"VLAN\s*:\s*(.*)")
-            profile_details['idle_timeout'] = extract_value(r"Idle Timeout\s*:\s*(.*)")
-            profile_details['session_timeout'] = extract_value(r"Session Timeout\s*:\s*(.*)")
-            profile_details['aaa_override'] = extract_value(r"AAA Override\s*:\s*(.*)")
-            profile_details['nac'] = extract_value(r"NAC\s*:\s*(.*)")
-            profile_details['accounting_list'] = extract_value(r"Accounting List\s*:\s*(.*)")
-
-            # 2. Extrair QoS
-            profile_details['qos_per_ssid_ingress'] = extract_value(r"QOS per SSID\n\s+Ingress Service Name\s*:\s*(.*)")
-            profile_details['qos_per_ssid_egress'] = extract_value(
-                r"QOS per SSID\n(?:.*\n)\s+Egress Service Name\s*:\s*(.*)")
-            profile_details['qos_per_client_ingress'] = extract_value(
-                r"QOS per Client\n\s+Ingress Service Name\s*:\s*(.*)")
-            profile_details['qos_per_client_egress'] = extract_value(
-                r"QOS per Client\n(?:.*\n)\s+Egress Service Name\s*:\s*(.*)")
-
-            # 3. Determinar o modo de Switching
-            if "Flex Central Switching\s*:\s*ENABLED" in block:
+            # 1. Extrai os campos principais e de QoS percorrendo o bloco uma única vez
+            values, flags = self._parse_policy_profile(self.data, start, end)
+            profile_details.update(values)
+
+            # 2. Determinar o modo de Switching
+            if 'central_switching' in flags:
                 profile_details['switching_mode'] = 'Central'
 
-            # 4. Verificar o Profiling
-            if "RADIUS Profiling\s*:\s*ENABLED" in block:
-                profile_details['profiling'].append('RADIUS')
-            if "HTTP TLV caching\s*:\s*ENABLED" in block:
-                profile_details['profiling'].append('HTTP')
-            if "DHCP TLV caching\s*:\s*ENABLED" in block:
-                profile_details['profiling'].append('DHCP')
+            # 3. Verificar o Profiling
+            for method in ('RADIUS', 'HTTP', 'DHCP'):
+                if method in flags:
+                    profile_details['profiling'].append(method)
 
             # Converte a lista de profiling em uma string
             if not profile_details['profiling']:
@@ -831,3 +1143,116 @@ class ShowTechWireless:
             profiles_list.append(profile_details)
 
         return profiles_list
+
+
+def _load(path):
+    # Abre o arquivo e já monta o índice de seções, para que a medição da
+    # etapa 'load' não deixe esse custo para o primeiro extrator
+    show_tech = ShowTechWireless.from_path(path)
+    show_tech.sections
+    return show_tech
+
+
+# Estado de cada processo do pool: o arquivo é aberto uma única vez por
+# worker (mmap compartilha as páginas do page cache entre os processos) e o
+# índice de seções é reaproveitado por todos os extratores que ele executar.
+_worker_show_tech = None
+# Com medição, o registro da carga do worker, devolvido junto com o
+# primeiro extrator que ele executar
+_worker_records = []
+
+
+def _init_worker(path, profile=False):
+    global _worker_show_tech, _worker_records
+    if profile:
+        _worker_show_tech, record = measure('load', _load, path)
+        _worker_records = [record]
+    else:
+        _worker_show_tech = ShowTechWireless.from_path(path)
+
+
+def _run_extractor(name):
+    return name, getattr(_worker_show_tech, name)()
+
+
+def _run_extractor_profiled(name):
+    # Devolve (nome, (resultado, registros de tempo e memória medidos no
+    # worker)): o do extrator e, na primeira chamada, o da carga do arquivo
+    global _worker_records
+    result, record = measure(name, getattr(_worker_show_tech, name))
+    records, _worker_records = [*_worker_records, record], []
+    return name, (result, records)
+
+
+def extract(path, extractors, workers=None, cache=None, progress=None, profiler=None):
+    """Executa os extratores ``extractors`` sobre o show tech em ``path``.
+
+    Com ``workers`` maior que 1 os extratores rodam em paralelo num
+    ProcessPoolExecutor; cada worker recebe só o caminho do arquivo e devolve
+    apenas o resultado do extrator. Retorna um dict {nome: resultado}.
+
+    Com ``cache`` (um extract_cache.ContextCache), o resultado de cada extrator
+    fica guardado sob ShowTechWireless.extractor_key e só os extratores cujas
+    seções mudaram desde a última extração são executados de novo.
+
+    ``progress``, se informado, é chamado como progress(nome, concluídos, total)
+    a cada extrator concluído (ou encontrado no cache).
+
+    Com ``profiler`` (um profiling.Profiler), a abertura do arquivo (com a
+    montagem do índice de seções) e cada extrator executado ganham um
+    registro de tempo e memória. Em paralelo, cada worker acrescenta também
+    o registro 'load' da sua própria abertura do arquivo; o campo 'pid'
+    identifica o processo de cada registro.
+    """
+    done = 0
+
+    def report(name):
+        nonlocal done
+        done += 1
+        if progress is not None:
+            progress(name, done, len(extractors))
+
+    if profiler is not None:
+        show_tech, record = measure('load', _load, path)
+        profiler.add(record)
+    else:
+        show_tech = ShowTechWireless.from_path(path)
+
+    with show_tech:
+        keys = {}
+        results = {}
+        if cache is not None:
+            for name in extractors:
+                keys[name] = show_tech.extractor_key(name)
+                cached = cache.get(keys[name])
+                if cached is not None:
+                    results[name] = cached[0]
+                    report(name)
+        pending = [name for name in extractors if name not in results]
+
+        if pending and workers and workers > 1:
+            run = _run_extractor if profiler is None else _run_extractor_profiled
+            with ProcessPoolExecutor(max_workers=min(workers, len(pending)),
+                                     initializer=_init_worker,
+                                     initargs=(os.fspath(path), profiler is not None)) as executor:
+                for name, result in executor.map(run, pending):
+                    if profiler is not None:
+                        result, records = result
+                        for record in records:
+                            profiler.add(record)
+                    results[name] = result
+                    report(name)
+        else:
+            for name in pending:
+                if profiler is not None:
+                    results[name], record = measure(name, getattr(show_tech, name))
+                    profiler.add(record)
+                else:
+                    results[name] = getattr(show_tech, name)()
+                report(name)
+
+    if cache is not None:
+        # Guardado numa tupla para distinguir um resultado None de um miss
+        for name in pending:
+            cache.put(keys[name], (results[name],))
+    return {name: results[name] for name in extractors}
@@ -0,0 +1,453 @@
+"""Cache dos templates .docx usados na geração dos LLDs.
+
+Abrir um DocxTemplate descompacta o .docx e analisa o XML de cada parte, e
+cada render aplica o patch_xml do docxtpl e compila o XML do corpo, dos
+cabeçalhos e rodapés como templates Jinja. Aqui esse trabalho é feito uma vez
+por template (chave: caminho + mtime) e cada render recebe um DocxTemplate
+novo, com uma cópia (deepcopy) do Document já analisado e os templates Jinja
+já compilados. Ao salvar, as partes que não mudaram (imagens, estilos,
+glossário...) são copiadas ainda comprimidas do template para o documento
+gerado.
+
+As tabelas grandes (ROW_KEYS: lista de APs, ACLs, WLANs) não passam pelo
+Jinja: a linha do template é clonada no lxml e preenchida para cada registro.
+"""
+import copy
+import io
+import os
+import re
+import struct
+import threading
+import time
+import zipfile
+import zlib
+from collections import OrderedDict
+from xml.sax.saxutils import escape
+
+from docx import Document
+from docx.opc.pkgwriter import PackageWriter
+from docxtpl import DocxTemplate
+from jinja2 import Environment, Template, Undefined
+from lxml import etree
+
+# Quantidade de templates diferentes mantidos em memória
+CACHE_SIZE = 8
+
+PARAGRAPH = re.compile(r"<w:p([ >])")
+PARAGRAPH_BREAK = re.compile(r"\n<w:p([ >])")
+XML_ENCODING = re.compile(r'<\?xml[^\?]+\bencoding="([^"]+)"', re.I)
+
+# Chaves do contexto cujas tabelas ({%tr for x in chave %} de uma linha só)
+# são montadas clonando a linha do template em vez de renderizadas pelo Jinja
+ROW_KEYS = frozenset(('ap_list', 'acl', 'wlan'))
+ROW_MARKER = 'lld-rows'
+# Já depois do patch_xml: o {%tr ...%} virou {% ... %} em volta da linha
+ROW_LOOP = re.compile(
+    r'{%\s*for\s+(\w+)\s+in\s+(\w+)\s*%}(<w:tr[ >](?:(?!<w:tr[ >]).)*?</w:tr>){%\s*endfor\s*%}',
+    re.DOTALL)
+ROW_FIELD = re.compile(r'{{\s*(\w+)\.(\w+)\s*}}')
+ROOT_TAG = re.compile(r'<[^>]+>')
+# Caracteres que o resolve_listing do docxtpl transforma em quebras/tabs
+LISTING_CHARS = re.compile('[\t\a\n\f]')
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+# Mesma resolução de "x.campo" do Jinja: atributo e, se não existir, item
+_jinja = Environment()
+
+# Cabeçalho local de um membro do zip: assinatura + 26 bytes, com os tamanhos
+# do nome e do campo extra nos dois últimos campos
+LOCAL_HEADER = struct.Struct('<4s22xHH')
+
+# Estruturas gravadas pelo PassThroughPkgWriter (APPNOTE.TXT do formato zip)
+ZIP_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+ZIP_CENTRAL_HEADER = struct.Struct('<4s6H3L5H2L')
+ZIP_END_RECORD = struct.Struct('<4s4H2LH')
+ZIP_VERSION = 20
+ZIP_UTF8_FLAG = 0x800
+# Bits de flag mantidos nos membros copiados: opções do deflate e nome em UTF-8
+ZIP_COPIED_FLAGS = 0x806
+# Permissões que o zipfile.writestr grava nos membros novos
+ZIP_FILE_ATTRIBUTES = 0o600 << 16
+ZIP64_LIMIT = 0xFFFFFFFF
+
+
+def zip_members(data):
+    """Mapeia cada membro do zip em ``data`` para (ZipInfo, bytes ainda comprimidos)."""
+    view = memoryview(data)
+    members = {}
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        for info in archive.infolist():
+            # Membros criptografados ou com data descriptor são regravados
+            if info.flag_bits & 0x09:
+                continue
+            signature, name_length, extra_length = LOCAL_HEADER.unpack_from(data, info.header_offset)
+            if signature != b'PK\x03\x04':
+                continue
+            start = info.header_offset + LOCAL_HEADER.size + name_length + extra_length
+            members[info.filename] = (info, view[start:start + info.compress_size])
+    return members
+
+
+class PassThroughPkgWriter:
+    """PhysPkgWriter do python-docx que não recomprime as partes inalteradas.
+
+    Uma parte cujo conteúdo (tamanho + CRC) é igual ao do membro de mesmo nome
+    no template tem os bytes já comprimidos copiados direto para a saída; as
+    demais são comprimidas com deflate, como faz o python-docx. O zip é
+    montado aqui mesmo (cabeçalhos locais, diretório central e fim do
+    diretório), sem depender dos internos do zipfile.
+    """
+
+    def __init__(self, stream, members):
+        self._stream = stream
+        self._members = members
+        self._offset = 0
+        self._central = []
+        # Nome do membro -> (CRC, tamanho) do conteúdo gravado, para verify()
+        self.written = {}
+
+    def write(self, pack_uri, blob):
+        name = pack_uri.membername
+        crc = zlib.crc32(blob)
+        member = self._members.get(name)
+        if member is not None and member[0].file_size == len(blob) and member[0].CRC == crc:
+            source, raw = member
+            self._add(name, raw, crc, len(blob), source.compress_type,
+                      source.flag_bits & ZIP_COPIED_FLAGS, source.date_time, source.external_attr)
+        else:
+            compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+            raw = compressor.compress(blob) + compressor.flush()
+            self._add(name, raw, crc, len(blob), zipfile.ZIP_DEFLATED, 0,
+                      time.localtime()[:6], ZIP_FILE_ATTRIBUTES)
+        self.written[name] = (crc, len(blob))
+
+    def _add(self, name, raw, crc, size, method, flags, date_time, external_attr):
+        try:
+            filename = name.encode('ascii')
+        except UnicodeEncodeError:
+            filename = name.encode('utf-8')
+            flags |= ZIP_UTF8_FLAG
+        if max(self._offset, len(raw), size) >= ZIP64_LIMIT or len(self._central) >= 0xFFFF:
+            raise zipfile.LargeZipFile(f'{name}: o pacote precisaria de ZIP64')
+        year, month, day, hour, minute, second = date_time
+        dos_date = max(year - 1980, 0) << 9 | month << 5 | day
+        dos_time = hour << 11 | minute << 5 | second // 2
+        fields = (ZIP_VERSION, flags, method, dos_time, dos_date, crc, len(raw), size, len(filename))
+        self._stream.write(ZIP_LOCAL_HEADER.pack(b'PK\x03\x04', *fields, 0) + filename)
+        self._stream.write(raw)
+        self._central.append(ZIP_CENTRAL_HEADER.pack(
+            b'PK\x01\x02', ZIP_VERSION, *fields, 0, 0, 0, 0, external_attr, self._offset) + filename)
+        self._offset += ZIP_LOCAL_HEADER.size + len(filename) + len(raw)
+
+    def close(self):
+        central = b''.join(self._central)
+        if self._offset >= ZIP64_LIMIT:
+            raise zipfile.LargeZipFile('o pacote precisaria de ZIP64')
+        self._stream.write(central)
+        self._stream.write(ZIP_END_RECORD.pack(
+            b'PK\x05\x06', 0, 0, len(self._central), len(self._central), len(central), self._offset, 0))
+
+    def verify(self, stream):
+        """
+        Relê o zip gravado em ``stream``: testzip() descomprime e confere o
+        CRC de cada membro, e cada membro precisa ter o nome, o CRC e o
+        tamanho da parte entregue pelo python-docx.
+        """
+        with zipfile.ZipFile(stream) as archive:
+            if archive.testzip() is not None:
+                return False
+            saved = {info.filename: (info.CRC, info.file_size) for info in archive.infolist()}
+        return saved == self.written
+
+
+class RowPrototype:
+    """Linha de tabela do template, preenchida direto no lxml para cada registro.
+
+    Só é usada quando a linha contém apenas {{ var.campo }} (sem filtros,
+    condicionais ou laços); qualquer outra coisa fica com o Jinja.
+    """
+
+    def __init__(self, element, xml, wrap, var, fields):
+        self.element = element
+        self.xml = xml
+        self.wrap = wrap
+        self.var = var
+        # (posição do w:t na linha, pedaços: str literal ou nome do campo em tupla)
+        self.fields = fields
+
+    @classmethod
+    def parse(cls, row_xml, root_tag, var):
+        wrap = (root_tag, '</' + root_tag[1:].split(None, 1)[0].rstrip('>') + '>')
+        try:
+            element = etree.fromstring(wrap[0] + row_xml + wrap[1])[0]
+        except etree.XMLSyntaxError:
+            return None
+        fields = []
+        for position, text in enumerate(element.iter(W_NS + 't')):
+            value = text.text or ''
+            if '{' not in value and '}' not in value:
+                continue
+            pieces = []
+            last = 0
+            for match in ROW_FIELD.finditer(value):
+                if match.group(1) != var:
+                    return None
+                pieces.append(value[last:match.start()])
+                pieces.append((match.group(2),))
+                last = match.end()
+            pieces.append(value[last:])
+            if any('{' in piece or '}' in piece for piece in pieces if isinstance(piece, str)):
+                return None
+            fields.append((position, [piece for piece in pieces if piece != '']))
+        if not fields:
+            return None
+        return cls(element, row_xml, wrap, var, fields)
+
+    def placeholder(self, index):
+        """Linha sem os campos que marca no XML renderizado onde as linhas entram.
+
+        Mantém as células da linha original para que o fix_tables do docxtpl
+        veja a mesma quantidade de colunas.
+        """
+        return ROW_FIELD.sub('', self.xml).replace('<w:tr', f'<w:tr {ROW_MARKER}="{index}"', 1)
+
+    @staticmethod
+    def _value(record, field):
+        value = _jinja.getattr(record, field)
+        return '' if isinstance(value, Undefined) else str(value)
+
+    def rows(self, records, template):
+        """Gera uma linha (elemento lxml) por registro."""
+        for record in records:
+            texts = [(position, ''.join(piece if isinstance(piece, str) else self._value(record, piece[0])
+                                        for piece in pieces))
+                     for position, pieces in self.fields]
+            if any(LISTING_CHARS.search(text) for _, text in texts):
+                yield self._listing_row(texts, template)
+                continue
+            row = copy.deepcopy(self.element)
+            elements = list(row.iter(W_NS + 't'))
+            for position, text in texts:
+                elements[position].text = text
+            yield row
+
+    def _listing_row(self, texts, template):
+        # Valores com \n, \t... seguem o mesmo caminho do Jinja: texto no XML
+        # e resolve_listing do docxtpl para virar w:br, w:tab etc. O valor é
+        # escapado antes de entrar no XML (&, < e > de um remark de ACL), e um
+        # XML inválido levanta XMLSyntaxError em vez de ser corrigido em silêncio.
+        row = copy.deepcopy(self.element)
+        elements = list(row.iter(W_NS + 't'))
+        for position, _ in texts:
+            elements[position].text = f'\ue000{position}\ue000'
+        xml = etree.tostring(row, encoding='unicode')
+        for position, text in texts:
+            xml = xml.replace(f'\ue000{position}\ue000', escape(text))
+        xml = template.resolve_listing(xml)
+        return etree.fromstring(self.wrap[0] + xml + self.wrap[1])[0]
+
+
+class TemplateSource:
+    """Conteúdo imutável de um template: bytes do .docx, Document analisado e partes compiladas."""
+
+    def __init__(self, data):
+        self.data = data
+        self.members = zip_members(data)
+        self._document = None
+        self._compiled = {}
+        self._lock = threading.Lock()
+
+    def document(self):
+        """
+        Document novo para um render. O .docx é descompactado e analisado só
+        na primeira vez; depois cada chamada devolve uma cópia desse Document,
+        em que as partes XML são copiadas no lxml e as binárias (imagens)
+        compartilham os mesmos bytes.
+        """
+        with self._lock:
+            if self._document is None:
+                self._document = Document(io.BytesIO(self.data))
+            return copy.deepcopy(self._document)
+
+    def compiled(self, partname, get_xml, patch_xml, rows=False):
+        """
+        Retorna (template Jinja, encoding, linhas) da parte, compilando-a na
+        primeira vez. Com rows=True, os laços de uma linha sobre ROW_KEYS saem
+        do template Jinja e viram RowPrototype (ver CachedDocxTemplate.fix_tables).
+        """
+        with self._lock:
+            entry = self._compiled.get(partname)
+            if entry is None:
+                xml = get_xml()
+                match = XML_ENCODING.match(xml)
+                source = patch_xml(xml)
+                prototypes = []
+                if rows:
+                    source = self._extract_rows(source, prototypes)
+                template = Template(PARAGRAPH.sub(r"\n<w:p\1", source))
+                entry = (template, match.group(1) if match else 'utf-8', prototypes)
+                self._compiled[partname] = entry
+            return entry
+
+    @staticmethod
+    def _extract_rows(xml, prototypes):
+        root_tag = ROOT_TAG.match(xml).group(0)
+
+        def replace(match):
+            var, key, row = match.groups()
+            if key not in ROW_KEYS or '{%' in row or '{#' in row:
+                return match.group(0)
+            prototype = RowPrototype.parse(row, root_tag, var)
+            if prototype is None:
+                return match.group(0)
+            prototypes.append((key, prototype))
+            return prototype.placeholder(len(prototypes) - 1)
+
+        return ROW_LOOP.sub(replace, xml)
+
+
+class CachedDocxTemplate(DocxTemplate):
+    """DocxTemplate que reaproveita o Document e as partes compiladas de um TemplateSource.
+
+    Quando o render recebe um jinja_env próprio, o comportamento volta a ser o
+    do DocxTemplate, já que a compilação depende do ambiente.
+    """
+
+    def __init__(self, source):
+        super().__init__(io.BytesIO(source.data))
+        self._source = source
+        self._rows = ()
+        self._row_context = None
+
+    def init_docx(self, reload=True):
+        if not self.docx or (self.is_rendered and reload):
+            self.docx = self._source.document()
+            self.is_rendered = False
+
+    def _render_compiled(self, template, part, context):
+        self.current_rendering_part = part
+        dst_xml = PARAGRAPH_BREAK.sub(r"<w:p\1", template.render(context))
+        dst_xml = (
+            dst_xml.replace("{_{", "{{")
+            .replace("}_}", "}}")
+            .replace("{_%", "{%")
+            .replace("%_}", "%}")
+        )
+        return self.resolve_listing(dst_xml)
+
+    def save(self, filename, *args, **kwargs):
+        # Mesmo fluxo do DocxTemplate.save, mas o pacote é gravado pelo
+        # PassThroughPkgWriter em vez do writer padrão do python-docx
+        if not self.is_saved and not self.is_rendered:
+            self.init_docx(reload=False)
+        self.pre_processing()
+        data = self._pass_through_package()
+        if data is None:
+            self.docx.save(filename, *args, **kwargs)
+        elif hasattr(filename, 'write'):
+            filename.write(data)
+        else:
+            with open(filename, 'wb') as docx_file:
+                docx_file.write(data)
+        self.post_processing(filename)
+        self.is_saved = True
+
+    def _pass_through_package(self):
+        """
+        Bytes do .docx montado pelo PassThroughPkgWriter, ou None quando o
+        save padrão do python-docx deve ser usado: o writer depende de métodos
+        internos do PackageWriter, que podem mudar numa atualização do
+        python-docx, e o zip gravado precisa passar na releitura de verify().
+        """
+        package = self.docx.part.package
+        parts = package.parts
+        for part in parts:
+            part.before_marshal()
+        output = io.BytesIO()
+        writer = PassThroughPkgWriter(output, self._source.members)
+        try:
+            PackageWriter._write_content_types_stream(writer, parts)
+            PackageWriter._write_pkg_rels(writer, package.rels)
+            PackageWriter._write_parts(writer, parts)
+            writer.close()
+        except (AttributeError, zipfile.LargeZipFile):
+            return None
+        output.seek(0)
+        if not writer.verify(output):
+            return None
+        return output.getvalue()
+
+    def build_xml(self, context, jinja_env=None):
+        if jinja_env is not None:
+            self._rows = ()
+            return super().build_xml(context, jinja_env)
+        part = self.docx._part
+        template, _, self._rows = self._source.compiled(
+            str(part.partname), self.get_xml, self.patch_xml, rows=True)
+        self._row_context = context
+        return self._render_compiled(template, part, context)
+
+    def fix_tables(self, xml):
+        # Troca cada linha marcadora pelas linhas clonadas do RowPrototype
+        tree = super().fix_tables(xml)
+        if not self._rows:
+            return tree
+        markers = [row for row in tree.iter(W_NS + 'tr') if row.get(ROW_MARKER) is not None]
+        for marker in markers:
+            key, prototype = self._rows[int(marker.get(ROW_MARKER))]
+            records = self._row_context.get(key) or ()
+            parent = marker.getparent()
+            position = parent.index(marker)
+            parent[position:position + 1] = list(prototype.rows(records, self))
+        return tree
+
+    def build_headers_footers_xml(self, context, uri, jinja_env=None):
+        if jinja_env is not None:
+            yield from super().build_headers_footers_xml(context, uri, jinja_env)
+            return
+        for relKey, part in self.get_headers_footers(uri):
+            template, encoding, _ = self._source.compiled(
+                str(part.partname), lambda: self.get_part_xml(part), self.patch_xml)
+            yield relKey, self._render_compiled(template, part, context).encode(encoding)
+
+
+class TemplateCache:
+    """Cache LRU de templates .docx, invalidado quando o arquivo muda no disco."""
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        """Retorna um DocxTemplate novo para ``path``, pronto para um único render."""
+        key = os.path.realpath(path)
+        stat = os.stat(key)
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                return CachedDocxTemplate(entry[1])
+
+        with open(key, 'rb') as template_file:
+            source = TemplateSource(template_file.read())
+
+        with self._lock:
+            self._entries[key] = (version, source)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return CachedDocxTemplate(source)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = TemplateCache()
+
+
+def load_template(path):
+    """Atalho para o cache global do processo."""
+    return _cache.get(path)